@@ -0,0 +1,263 @@
+"""Codec micro-benchmarks for zigpy.types and zigpy.zcl.foundation
+
+Times encoding and decoding of representative ZCL and ZDO frames. Run with
+``python benchmarks/bench_codec.py [--json results.json] [-k filter]`` and
+compare the JSON output of two commits to spot codec regressions.
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import zigpy.types as t  # noqa: E402
+import zigpy.zdo.types as zdo_t  # noqa: E402
+from zigpy.zcl import Cluster, foundation  # noqa: E402
+from zigpy.zcl.clusters.general import Groups, LevelControl  # noqa: E402
+from zigpy.zcl.clusters.lighting import Color  # noqa: E402
+
+BENCHMARKS = []
+
+
+def benchmark(name):
+    """Register a benchmark
+
+    The decorated function sets up the data and returns the callable to time.
+    """
+    def decorator(setup):
+        BENCHMARKS.append((name, setup))
+        return setup
+    return decorator
+
+
+def _zcl_decode(cluster_id, command_id, data):
+    cluster = Cluster.from_id(None, cluster_id)
+    return lambda: cluster.deserialize(1, 0, False, command_id, data)
+
+
+def _read_attributes_response(count):
+    records = []
+    for attrid in range(count):
+        rar = foundation.ReadAttributeRecord()
+        rar.attrid = attrid
+        rar.status = 0
+        rar.value = foundation.TypeValue()
+        rar.value.type = 0x21
+        rar.value.value = t.uint16_t(attrid)
+        records.append(rar)
+    return records
+
+
+def _report_attributes(count):
+    return b''.join(
+        t.uint16_t(attrid).serialize() + b'\x21' + t.uint16_t(attrid).serialize()
+        for attrid in range(count)
+    )
+
+
+def _reporting_configs(count):
+    configs = []
+    for attrid in range(count):
+        cfg = foundation.AttributeReportingConfig()
+        cfg.direction = 0
+        cfg.attrid = attrid
+        cfg.datatype = 0x21
+        cfg.min_interval = 1
+        cfg.max_interval = 300
+        cfg.reportable_change = 1
+        configs.append(cfg)
+    return configs
+
+
+def _ieee(i):
+    return t.EUI64([0x00, 0x0d, 0x6f, 0x00, 0x00, 0x00, i >> 8, i & 0xff])
+
+
+@benchmark('zcl.read_attributes.request.encode')
+def bench_read_attributes_request_encode():
+    schema = foundation.COMMANDS[0x00][1]
+    args = ([0, 1, 2, 3, 4, 5, 6, 7], )
+    return lambda: t.serialize(args, schema)
+
+
+@benchmark('zcl.read_attributes.request.decode')
+def bench_read_attributes_request_decode():
+    schema = foundation.COMMANDS[0x00][1]
+    data = t.serialize(([0, 1, 2, 3, 4, 5, 6, 7], ), schema)
+    return _zcl_decode(0x0000, 0x00, data)
+
+
+@benchmark('zcl.read_attributes.response.encode')
+def bench_read_attributes_response_encode():
+    schema = foundation.COMMANDS[0x01][1]
+    args = (_read_attributes_response(10), )
+    return lambda: t.serialize(args, schema)
+
+
+@benchmark('zcl.read_attributes.response.decode')
+def bench_read_attributes_response_decode():
+    schema = foundation.COMMANDS[0x01][1]
+    data = t.serialize((_read_attributes_response(10), ), schema)
+    return _zcl_decode(0x0000, 0x01, data)
+
+
+def _register_report(count):
+    @benchmark('zcl.report_attributes.%d.decode' % (count, ))
+    def bench_report_decode():
+        return _zcl_decode(0x0006, 0x0a, _report_attributes(count))
+
+    @benchmark('zcl.report_attributes.%d.encode' % (count, ))
+    def bench_report_encode():
+        schema = foundation.COMMANDS[0x0a][1]
+        records, _ = foundation.AttributeReportList.deserialize(
+            _report_attributes(count))
+        return lambda: t.serialize((records, ), schema)
+
+
+for _count in (1, 10, 50):
+    _register_report(_count)
+
+
+@benchmark('zcl.configure_reporting.encode')
+def bench_configure_reporting_encode():
+    schema = foundation.COMMANDS[0x06][1]
+    args = (_reporting_configs(5), )
+    return lambda: t.serialize(args, schema)
+
+
+@benchmark('zcl.configure_reporting.decode')
+def bench_configure_reporting_decode():
+    schema = foundation.COMMANDS[0x06][1]
+    data = t.serialize((_reporting_configs(5), ), schema)
+    return _zcl_decode(0x0006, 0x06, data)
+
+
+def _mgmt_lqi_rsp(count):
+    neighbors = zdo_t.Neighbors()
+    neighbors.Entries = t.uint8_t(count)
+    neighbors.StartIndex = t.uint8_t(0)
+    neighbors.NeighborTableList = t.LVList(zdo_t.Neighbor)()
+    for i in range(count):
+        neighbor = zdo_t.Neighbor()
+        neighbor.PanId = _ieee(0xffff)
+        neighbor.IEEEAddr = _ieee(i)
+        neighbor.NWKAddr = t.uint16_t(i)
+        neighbor.NeighborType = t.uint8_t(0x25)
+        neighbor.PermitJoining = t.uint8_t(2)
+        neighbor.Depth = t.uint8_t(1)
+        neighbor.LQI = t.uint8_t(200)
+        neighbors.NeighborTableList.append(neighbor)
+    return [zdo_t.Status.SUCCESS, neighbors]
+
+
+@benchmark('zdo.mgmt_lqi_rsp.encode')
+def bench_mgmt_lqi_rsp_encode():
+    schema = zdo_t.CLUSTERS[0x8031][2]
+    args = _mgmt_lqi_rsp(16)
+    return lambda: t.serialize(args, schema)
+
+
+@benchmark('zdo.mgmt_lqi_rsp.decode')
+def bench_mgmt_lqi_rsp_decode():
+    schema = zdo_t.CLUSTERS[0x8031][2]
+    data = t.serialize(_mgmt_lqi_rsp(16), schema)
+    return lambda: t.deserialize(data, schema)
+
+
+def _simple_desc_rsp(count):
+    sd = zdo_t.SizePrefixedSimpleDescriptor()
+    sd.endpoint = t.uint8_t(1)
+    sd.profile = t.uint16_t(260)
+    sd.device_type = t.uint16_t(0x0100)
+    sd.device_version = t.uint8_t(1)
+    sd.input_clusters = t.LVNumericList(t.uint16_t)(range(count))
+    sd.output_clusters = t.LVNumericList(t.uint16_t)(range(count))
+    return [zdo_t.Status.SUCCESS, t.uint16_t(0x1234), sd]
+
+
+@benchmark('zdo.simple_desc_rsp.encode')
+def bench_simple_desc_rsp_encode():
+    schema = zdo_t.CLUSTERS[0x8004][2]
+    args = _simple_desc_rsp(30)
+    return lambda: t.serialize(args, schema)
+
+
+@benchmark('zdo.simple_desc_rsp.decode')
+def bench_simple_desc_rsp_decode():
+    schema = zdo_t.CLUSTERS[0x8004][2]
+    data = t.serialize(_simple_desc_rsp(30), schema)
+    return lambda: t.deserialize(data, schema)
+
+
+@benchmark('types.eui64.hash')
+def bench_eui64_hash():
+    devices = {_ieee(i): i for i in range(100)}
+    keys = [_ieee(i) for i in range(100)]
+
+    def lookup():
+        for key in keys:
+            devices[key]
+    return lookup
+
+
+@benchmark('types.serialize.command_schemas')
+def bench_serialize_command_schemas():
+    commands = [
+        (LevelControl.server_commands[0x0000][1], (254, 10)),
+        (Color.server_commands[0x000a][1], (370, 10)),
+        (Groups.server_commands[0x0000][1], (0x0001, b'Living room')),
+        (foundation.COMMANDS[0x0c][1], (0, 16)),
+    ]
+
+    def serialize():
+        for schema, args in commands:
+            t.serialize(args, schema)
+    return serialize
+
+
+def run(name, setup, repeat):
+    func = setup()
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    timings = [
+        elapsed / number for elapsed in timer.repeat(repeat=repeat, number=number)
+    ]
+    return {
+        'loops': number,
+        'best_ns': min(timings) * 1e9,
+        'mean_ns': sum(timings) / len(timings) * 1e9,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--json', help="write the results to this file")
+    parser.add_argument('-k', dest='filter', default='',
+                        help="only run benchmarks whose name contains this")
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args(argv)
+
+    results = {}
+    for name, setup in BENCHMARKS:
+        if args.filter not in name:
+            continue
+        results[name] = run(name, setup, args.repeat)
+        print('%-42s %12.0f ns' % (name, results[name]['best_ns']))
+
+    if args.json:
+        output = {
+            'timestamp': time.time(),
+            'python': platform.python_version(),
+            'implementation': platform.python_implementation(),
+            'results': results,
+        }
+        with open(args.json, 'w') as f:
+            json.dump(output, f, indent=2, sort_keys=True)
+
+
+if __name__ == '__main__':
+    main()
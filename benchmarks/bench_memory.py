@@ -0,0 +1,78 @@
+"""Per-record memory footprint of decoded zigpy records
+
+Decodes a batch of records with the slot based classes and compares the
+allocated memory with equivalent classes carrying a per-instance __dict__.
+
+Run with ``python benchmarks/bench_memory.py``.
+"""
+import gc
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import zigpy.zdo.types as zdo_t  # noqa: E402
+from zigpy.zcl import foundation  # noqa: E402
+
+RECORDS = 10000
+
+
+def _measure(factory):
+    gc.collect()
+    tracemalloc.start()
+    start = tracemalloc.take_snapshot()
+    records = [factory() for _ in range(RECORDS)]
+    end = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    size = sum(stat.size_diff for stat in end.compare_to(start, 'filename'))
+    del records
+    return size / RECORDS
+
+
+def _with_dict(cls):
+    """Copy of ``cls`` whose instances store attributes in a __dict__"""
+    return type(cls.__name__, (object, ), {})
+
+
+def _clone(obj, cls):
+    clone = cls()
+    for name in obj.__slots__:
+        if hasattr(obj, name):
+            setattr(clone, name, getattr(obj, name))
+    return clone
+
+
+def main():
+    rar_data = b'\x00\x00\x00\x20\x99'
+    arc = foundation.AttributeReportingConfig()
+    arc.direction = 0
+    arc.attrid = 0
+    arc.datatype = 0x20
+    arc.min_interval = 1
+    arc.max_interval = 2
+    arc.reportable_change = 3
+    arc_data = arc.serialize()
+    neighbor_data = bytes(range(22))
+
+    cases = [
+        ('TypeValue', lambda: foundation.TypeValue.deserialize(b'\x20\x99')[0]),
+        ('ReadAttributeRecord', lambda: foundation.ReadAttributeRecord.deserialize(rar_data)[0]),
+        ('AttributeReportingConfig', lambda: foundation.AttributeReportingConfig.deserialize(arc_data)[0]),
+        ('Neighbor', lambda: zdo_t.Neighbor.deserialize(neighbor_data)[0]),
+    ]
+
+    print('%-26s %12s %12s %8s' % ('record', 'slots (B)', '__dict__ (B)', 'saved'))
+    for name, factory in cases:
+        sample = factory()
+        dict_cls = _with_dict(type(sample))
+        # Decoded values are shared so only the record objects are compared
+        slotted = _measure(lambda: _clone(sample, type(sample)))
+        with_dict = _measure(lambda: _clone(sample, dict_cls))
+        print('%-26s %12.1f %12.1f %7.0f%%' % (
+            name, slotted, with_dict, 100 * (1 - slotted / with_dict),
+        ))
+
+
+if __name__ == '__main__':
+    main()
@@ -4,10 +4,12 @@ from unittest import mock
 import pytest
 
 import zigpy.types as t
+import zigpy.zdo.types as zdo_t
 from zigpy.application import ControllerApplication
 from zigpy import profiles
 from zigpy.quirks import CustomDevice
 from zigpy.device import Status
+from zigpy.zcl import AttributeSource, foundation
 
 
 def make_app(database_file):
@@ -18,6 +20,11 @@ def make_ieee(init=0):
     return t.EUI64(map(t.uint8_t, range(init, init + 8)))
 
 
+def make_node_desc(max_incoming):
+    data = b'\x02\x40\x80\x15\x11\x52' + t.uint16_t(max_incoming).serialize()
+    return zdo_t.NodeDescriptor.deserialize(data + b'\x00\x2c\x52\x00\x00')[0]
+
+
 class FakeCustomDevice(CustomDevice):
     def __init__(self, application, ieee, nwk, replaces):
         super().__init__(application, ieee, nwk, replaces)
@@ -31,7 +38,7 @@ async def _initialize(self):
 
 def fake_get_device(device):
     if device.endpoints.get(1) is not None and device[1].profile_id == 65535:
-        return FakeCustomDevice(device.application, make_ieee(1), 199, {})
+        return FakeCustomDevice(device.application, make_ieee(1), 199, device)
     return device
 
 
@@ -45,6 +52,7 @@ async def test_database(tmpdir):
     app.handle_join(99, ieee, 0)
 
     dev = app.get_device(ieee)
+    dev.node_desc = make_node_desc(100)
     ep = dev.add_endpoint(1)
     ep.profile_id = 260
     ep.device_type = profiles.zha.DeviceType.PUMP
@@ -60,6 +68,15 @@ async def test_database(tmpdir):
     clus._update_attribute(0, 99)
     clus._update_attribute(4, bytes('Custom', 'ascii'))
     clus._update_attribute(5, bytes('Model', 'ascii'))
+    clus._update_applied_reporting(clus._reporting_config(0, 1, 300, 1))
+
+    async def mockrequest(*args, **kwargs):
+        record = foundation.ConfigureReportingResponseRecord()
+        record.status = foundation.Status.SUCCESS
+        return [[record]]
+
+    clus.request = mockrequest
+    await clus.configure_reporting('power_source', 10, 600, 1)
     clus.listener_event('cluster_command', 0)
     clus.listener_event('zdo_command')
 
@@ -67,6 +84,7 @@ async def test_database(tmpdir):
     custom_ieee = make_ieee(1)
     app.handle_join(199, custom_ieee, 0)
     dev = app.get_device(custom_ieee)
+    dev.node_desc = make_node_desc(50)
     app.device_initialized(dev)
     ep = dev.add_endpoint(1)
     ep.profile_id = 65535
@@ -82,16 +100,24 @@ async def test_database(tmpdir):
     with mock.patch('zigpy.quirks.get_device', fake_get_device):
         app2 = make_app(db)
     dev = app2.get_device(ieee)
+    assert dev.max_payload == 100
     assert dev.endpoints[1].device_type == profiles.zha.DeviceType.PUMP
     assert dev.endpoints[2].device_type == 0xfffd
     assert dev.endpoints[2].in_clusters[0]._attr_cache[0] == 99
     assert dev.endpoints[2].in_clusters[0]._attr_cache[4] == bytes('Custom', 'ascii')
     assert dev.endpoints[2].in_clusters[0]._attr_cache[5] == bytes('Model', 'ascii')
+    assert dev.endpoints[2].in_clusters[0].cache_freshness()[0] == (None, AttributeSource.DB)
+    assert dev.endpoints[2].in_clusters[0]._applied_reporting == {
+        0: (1, 300, 1),
+        7: (10, 600, 1),
+    }
     assert dev.endpoints[2].manufacturer == 'Custom'
     assert dev.endpoints[2].model == 'Model'
     assert dev.endpoints[2].out_clusters[1].cluster_id == 1
     assert dev.endpoints[3].device_type == profiles.zll.DeviceType.COLOR_LIGHT
     dev = app2.get_device(custom_ieee)
+    assert isinstance(dev, FakeCustomDevice)
+    assert dev.max_payload == 50
 
     app.handle_leave(99, ieee)
 
@@ -187,6 +187,12 @@ def test_deserialize(app, ieee):
     dev = mock.MagicMock()
     app.deserialize(dev, 1, 1, b'')
     assert dev.deserialize.call_count == 1
+    # Overrides without the lazy argument keep working
+    dev.deserialize.assert_called_with(1, 1, b'')
+
+    app.lazy_deserialize = True
+    app.deserialize(dev, 1, 1, b'')
+    dev.deserialize.assert_called_with(1, 1, b'', lazy=True)
 
 
 def test_handle_message(app, ieee):
@@ -209,3 +215,93 @@ async def test_broadcast(app):
 @pytest.mark.asyncio
 async def test_shutdown(app):
     await app.shutdown()
+
+
+def _interview_device(app, i, nwk, results):
+    dev = app.add_device(t.EUI64([0, 0, 0, 0, 0, 0, 0, i]), nwk)
+
+    async def initialize():
+        results.append(i)
+        assert len(app.interviews._running) <= app.interviews.max_concurrent
+        await asyncio.sleep(0)
+        if i in failing:
+            failing.remove(i)
+            raise RuntimeError
+        dev.status = device.Status.ENDPOINTS_INIT
+
+    failing = set()
+    dev._initialize = initialize
+    dev.failing = failing
+    return dev
+
+
+@pytest.mark.asyncio
+async def test_interview_scheduler_priority(app):
+    app.interviews.max_concurrent = 1
+    results = []
+    end_device = _interview_device(app, 1, 0x1001, results)
+    router = _interview_device(app, 2, 0x2002, results)
+    mains = _interview_device(app, 3, 0x3003, results)
+    mains.node_desc = mock.MagicMock(byte1=2, mac_capability_flags=0x04)
+
+    for dev in (end_device, router, mains):
+        app.handle_join(dev.nwk, dev.ieee, 0x0000)
+    assert app.interviews.queue_depth == 2
+    # A device joining through the router makes it a router
+    app.handle_join(0x4004, t.EUI64([9] * 8), router.nwk)
+    app.interviews.cancel(t.EUI64([9] * 8))
+    assert end_device.initializing is True
+
+    while app.interviews.status()['completed'] < 3:
+        await asyncio.sleep(0)
+    assert results == [1, 3, 2]
+    assert app.interviews.status() == {
+        'queued': 0, 'running': 0, 'waiting_retry': 0, 'completed': 3, 'failed': 0,
+    }
+
+
+@pytest.mark.asyncio
+async def test_join_handler_parent_hint(app, ieee):
+    app.interviews.max_concurrent = 0
+    results = []
+    end_device = _interview_device(app, 1, 0x1001, results)
+    app.interviews.schedule(end_device)
+    assert end_device.ieee in app.interviews._end_devices
+
+    # An initialized device rejoining through it still marks it a router
+    app.handle_join(1, ieee, None)
+    app.devices[ieee].status = device.Status.ENDPOINTS_INIT
+    app.devices[ieee].initializing = False
+    app.interviews.cancel(ieee)
+    app.handle_join(1, ieee, end_device.nwk)
+    assert end_device.ieee in app.interviews._routers
+    app.interviews.cancel(end_device.ieee)
+
+
+@pytest.mark.asyncio
+async def test_interview_scheduler_backoff(app):
+    app.interviews.backoff = 0
+    app.interviews.max_attempts = 2
+    results = []
+    retried = _interview_device(app, 1, 0x1001, results)
+    retried.failing.add(1)
+    app.interviews.schedule(retried)
+    while app.interviews.status()['waiting_retry'] == 0:
+        await asyncio.sleep(0)
+    assert retried.initializing is False
+
+    while app.interviews.status()['completed'] < 1:
+        await asyncio.sleep(0)
+    assert results == [1, 1]
+
+    failed = _interview_device(app, 2, 0x2002, results)
+
+    async def fail():
+        results.append(2)
+
+    failed._initialize = fail
+    app.interviews.schedule(failed)
+    while app.interviews.status()['failed'] < 1:
+        await asyncio.sleep(0)
+    assert results == [1, 1, 2, 2]
+    assert failed.initializing is False
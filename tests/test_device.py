@@ -4,6 +4,7 @@ from unittest import mock
 import pytest
 
 import zigpy.types as t
+import zigpy.zdo.types as zdo_t
 from zigpy import device, endpoint
 
 
@@ -33,6 +34,66 @@ async def test_initialize(monkeypatch, dev):
     assert 2 in dev.endpoints
 
 
+@pytest.mark.asyncio
+async def test_initialize_node_desc(monkeypatch):
+    dev = device.Device(mock.MagicMock(), t.EUI64([0] * 8), 1)
+    node_desc = zdo_t.NodeDescriptor()
+    node_desc.maximum_incoming_transfer_size = 100
+    requests = []
+
+    async def mockrequest(req, nwk, tries=None, delay=None):
+        requests.append(req)
+        if req == 0x0002:
+            return [0, nwk, node_desc]
+        return [0, None, [1]]
+
+    async def mockepinit(self):
+        return
+
+    monkeypatch.setattr(endpoint.Endpoint, 'initialize', mockepinit)
+    dev.zdo.request = mockrequest
+    await dev._initialize()
+
+    assert requests == [0x0002, 0x0005]
+    assert dev.node_desc is node_desc
+    assert dev.max_payload == 100
+    assert dev.status == device.Status.ENDPOINTS_INIT
+
+    # Not requested again
+    dev.status = device.Status.NEW
+    await dev._initialize()
+    assert requests == [0x0002, 0x0005, 0x0005]
+
+
+@pytest.mark.asyncio
+async def test_initialize_node_desc_fail(monkeypatch):
+    dev = device.Device(mock.MagicMock(), t.EUI64([0] * 8), 1)
+
+    requests = []
+
+    async def mockrequest(req, nwk, tries=None, delay=None):
+        requests.append(req)
+        if req == 0x0002:
+            raise asyncio.TimeoutError
+        return [0, None, [1]]
+
+    async def mockepinit(self):
+        return
+
+    monkeypatch.setattr(endpoint.Endpoint, 'initialize', mockepinit)
+    dev.zdo.request = mockrequest
+    await dev._initialize()
+
+    assert dev.node_desc is None
+    assert dev.status == device.Status.ENDPOINTS_INIT
+    assert requests == [0x0002, 0x0005]
+
+    # Best effort, a failed request isn't repeated by later interviews
+    dev.status = device.Status.NEW
+    await dev._initialize()
+    assert requests == [0x0002, 0x0005, 0x0005]
+
+
 @pytest.mark.asyncio
 async def test_initialize_fail(dev):
     async def mockrequest(req, nwk, tries=None, delay=None):
@@ -44,6 +105,54 @@ async def test_initialize_fail(dev):
     assert dev.status == device.Status.NEW
 
 
+@pytest.mark.asyncio
+async def test_initialize_endpoints_concurrently(monkeypatch):
+    dev = device.Device(mock.MagicMock(), t.EUI64([0] * 8), 1)
+    dev.status = device.Status.ZDO_INIT
+    for endpoint_id in range(1, 6):
+        dev.add_endpoint(endpoint_id)
+    active = []
+    initialized = []
+
+    async def mockepinit(self):
+        active.append(self.endpoint_id)
+        assert len(active) <= dev.endpoint_init_concurrency
+        await asyncio.sleep(0)
+        active.remove(self.endpoint_id)
+        initialized.append(self.endpoint_id)
+
+    monkeypatch.setattr(endpoint.Endpoint, 'initialize', mockepinit)
+    await dev._initialize()
+
+    assert sorted(initialized) == [1, 2, 3, 4, 5]
+    assert dev.status == device.Status.ENDPOINTS_INIT
+    assert dev.initializing is False
+    assert dev.application.device_initialized.call_count == 1
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize('error', [RuntimeError, asyncio.CancelledError])
+async def test_initialize_endpoints_fail(monkeypatch, error):
+    dev = device.Device(mock.MagicMock(), t.EUI64([0] * 8), 1)
+    dev.status = device.Status.ZDO_INIT
+    dev.add_endpoint(1)
+    dev.add_endpoint(2)
+    initialized = []
+
+    async def mockepinit(self):
+        if self.endpoint_id == 1:
+            raise error
+        initialized.append(self.endpoint_id)
+
+    monkeypatch.setattr(endpoint.Endpoint, 'initialize', mockepinit)
+    with pytest.raises(error):
+        await dev._initialize()
+
+    assert initialized == [2]
+    assert dev.status == device.Status.ZDO_INIT
+    assert dev.application.device_initialized.call_count == 0
+
+
 @pytest.mark.asyncio
 async def test_request(dev):
     assert dev.last_seen is None
@@ -73,6 +182,9 @@ def test_deserialize(dev):
     ep.deserialize = mock.MagicMock()
     dev.deserialize(3, 1, b'')
     assert ep.deserialize.call_count == 1
+    ep.deserialize.assert_called_with(1, b'')
+    dev.deserialize(3, 1, b'', lazy=True)
+    ep.deserialize.assert_called_with(1, b'', lazy=True)
 
 
 def test_handle_message_no_endpoint(dev):
@@ -113,3 +225,12 @@ async def test_broadcast():
     assert app.broadcast.call_args[0][2] == src_ep
     assert app.broadcast.call_args[0][3] == dst_ep
     assert app.broadcast.call_args[0][7] == data
+
+
+def test_max_payload(dev):
+    assert dev.max_payload == device.DEFAULT_MAX_PAYLOAD
+    dev.node_desc = zdo_t.NodeDescriptor()
+    dev.node_desc.maximum_incoming_transfer_size = 0
+    assert dev.max_payload == device.DEFAULT_MAX_PAYLOAD
+    dev.node_desc.maximum_incoming_transfer_size = 128
+    assert dev.max_payload == 128
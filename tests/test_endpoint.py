@@ -2,15 +2,18 @@ import asyncio
 from unittest import mock
 
 import pytest
+import zigpy.quirks
 import zigpy.zcl as zcl
 
-from zigpy import endpoint
+from zigpy import device, endpoint
+from zigpy.zcl.clusters.general import OnOff
 from zigpy.zdo import types
 
 
 @pytest.fixture
 def ep():
     dev = mock.MagicMock()
+    dev.max_payload = device.DEFAULT_MAX_PAYLOAD
     return endpoint.Endpoint(dev, 1)
 
 
@@ -129,6 +132,65 @@ def test_cluster_attr(ep):
     ep.basic
 
 
+@pytest.mark.asyncio
+async def test_lazy_clusters(ep):
+    async def mockrequest(req, nwk, epid, tries=None, delay=None):
+        sd = types.SimpleDescriptor()
+        sd.profile = 260
+        sd.device_type = 0xff
+        sd.input_clusters = [5]
+        sd.output_clusters = [6]
+        return [0, None, sd]
+
+    ep._device.zdo.request = mockrequest
+    await ep.initialize()
+    assert not ep.in_clusters.is_created(5)
+    assert not ep.out_clusters.is_created(6)
+    assert list(ep.in_clusters) == [5]
+    assert len(ep.out_clusters) == 1
+
+    scenes = ep.scenes
+    assert ep.in_clusters.is_created(5)
+    assert ep.in_clusters[5] is scenes
+    assert scenes.cluster_id == 5
+    assert scenes.endpoint is ep
+
+    ep.handle_message(False, 0, 6, 0, 1, [])
+    assert ep.out_clusters.is_created(6)
+    assert ep.out_clusters.get(6).cluster_id == 6
+
+
+def test_deserialize_keeps_out_cluster_lazy(ep):
+    ep.add_input_cluster_id(6)
+    ep.add_output_cluster_id(6)
+    tsn, command_id, is_reply, args = ep.deserialize(6, b'\x01\x05\x01')
+    assert (tsn, command_id, is_reply, args) == (5, 257, False, [])
+    assert ep.in_clusters.is_created(6)
+    assert not ep.out_clusters.is_created(6)
+
+
+def test_deserialize_lazy_legacy_override(ep):
+    class LegacyCluster(zigpy.quirks.CustomCluster, OnOff):
+        def deserialize(self, tsn, frame_type, is_reply, command_id, data):
+            return super().deserialize(tsn, frame_type, is_reply, command_id, data)
+
+    ep.add_input_cluster(6, LegacyCluster(ep))
+    tsn, command_id, is_reply, args = ep.deserialize(6, b'\x01\x05\x01', lazy=True)
+    assert (tsn, command_id, is_reply, args) == (5, 257, False, [])
+    assert endpoint._deserializes_lazily(zcl.Cluster)
+    assert not endpoint._deserializes_lazily(LegacyCluster)
+
+
+def test_lazy_cluster_add(ep):
+    c = ep.add_input_cluster(0)
+    ep.add_input_cluster_id(0)
+    assert ep.in_clusters[0] is c
+    ep.add_input_cluster_id(3)
+    assert ep.add_input_cluster(3) is ep.identify
+    with pytest.raises(KeyError):
+        ep.in_clusters[4]
+
+
 def test_request(ep):
     ep.profile_id = 260
     ep.request(7, 8, b'')
@@ -149,6 +149,7 @@ def test_custom_device():
     test_device = Device(None, None, None, replaces)
     assert test_device[1].profile_id == mock.sentinel.profile_id
     assert test_device[1].device_type == mock.sentinel.device_type
+    assert test_device.node_desc is replaces.node_desc
 
     assert 0x0000 in test_device[1].in_clusters
     assert 0x8888 in test_device[1].in_clusters
@@ -195,6 +196,14 @@ def test_kof_no_reply():
     ep.request.assert_called_with(mock.ANY, mock.ANY, mock.ANY, expect_reply=True)
     ep.reset_mock()
 
+    cluster.noop()
+    ep.request.assert_called_with(mock.ANY, mock.ANY, mock.ANY, expect_reply=True)
+    ep.reset_mock()
+
+    cluster.noop_noreply()
+    ep.request.assert_called_with(mock.ANY, mock.ANY, mock.ANY, expect_reply=False)
+    ep.reset_mock()
+
 
 def test_custom_cluster_idx():
     class TestClusterIdx(zigpy.quirks.CustomCluster):
@@ -1,3 +1,7 @@
+import copy
+
+import pytest
+
 import zigpy.types as t
 
 
@@ -21,6 +25,34 @@ def test_lvbytes():
     assert t.LVBytes.serialize(d) == b'\x041234'
 
 
+def test_long_octet_string():
+    frame = b'x\x04\x00abcdz'
+    d, offset = t.LongOctetString.deserialize_from(frame, 1)
+    assert offset == 7
+    assert d == b'abcd'
+    assert len(d) == 4
+    assert d._view.obj is frame
+    assert bytes(d) == b'abcd'
+    assert d[1:3] == b'bc'
+    assert d.serialize() == b'\x04\x00abcd'
+    assert {d: 1}[t.LongOctetString(b'abcd')] == 1
+
+    d, rest = t.LongOctetString.deserialize(bytearray(frame[1:]))
+    assert rest == b'z'
+    assert isinstance(d._view.obj, bytes)
+
+    with pytest.raises(ValueError):
+        t.LongOctetString.deserialize(b'\x05\x00abcd')
+
+
+def test_long_character_string():
+    d, rest = t.LongCharacterString.deserialize(b'\x03\x00\xc3\xa9!')
+    assert rest == b''
+    assert d.decode() == '\xe9!'
+    assert str(d) == '\xe9!'
+    assert d.serialize() == b'\x03\x00\xc3\xa9!'
+
+
 def test_lvlist():
     d, r = t.LVList(t.uint8_t).deserialize(b'\x0412345')
     assert r == b'5'
@@ -50,3 +82,362 @@ def test_struct():
 
     s = ts2.serialize()
     assert s == b'\xaa\xbb'
+
+
+def test_int_deserialize_from():
+    data = b'\xff\x01\x02\x03'
+    assert t.uint16_t.deserialize_from(data, 1) == (0x0201, 3)
+    assert t.int8s.deserialize_from(data, 0) == (-1, 1)
+    assert t.uint8_t.deserialize_from(memoryview(data), 3) == (3, 4)
+
+
+def test_lvbytes_deserialize_from():
+    d, offset = t.LVBytes.deserialize_from(memoryview(b'xx\x0412345'), 2)
+    assert offset == 7
+    assert d == b'1234'
+    assert isinstance(d, bytes)
+
+
+def test_list_deserialize_from():
+    data = b'\xaa\x01\x02\x03\x04'
+    r, offset = t.List(t.uint16_t).deserialize_from(data, 1)
+    assert r == [0x0201, 0x0403]
+    assert offset == len(data)
+
+    r, offset = t.LVList(t.uint8_t).deserialize_from(data, 1)
+    assert r == [2]
+    assert offset == 3
+
+    r, offset = t.fixed_list(2, t.uint8_t).deserialize_from(data, 3)
+    assert r == [3, 4]
+    assert offset == 5
+
+
+def test_struct_deserialize_from():
+    class TestStruct(t.Struct):
+        _fields = [('a', t.uint8_t), ('b', t.uint16_t)]
+
+    ts, offset = TestStruct.deserialize_from(b'\x00\xaa\x01\x02\xff', 1)
+    assert offset == 4
+    assert ts.a == 0xaa
+    assert ts.b == 0x0201
+
+
+def test_schema_deserialize():
+    schema = (t.uint8_t, t.LVBytes, t.uint16_t)
+    data = b'\x01\x02ab\x03\x04rest'
+    assert t.deserialize(data, schema) == ([1, b'ab', 0x0403], b'rest')
+    assert t.deserialize_from(data, schema[1:], 1) == ([b'ab', 0x0403], 6)
+
+
+def test_struct_fixed_layout_codec():
+    class TestStruct(t.Struct):
+        _fields = [
+            ('a', t.uint8_t),
+            ('b', t.int16s),
+            ('c', t.uint32_t),
+            ('d', t.Single),
+        ]
+
+    assert TestStruct._struct_codec is not None
+    assert TestStruct._struct_codec.size == 11
+
+    data = b'\x01\xfe\xff\x04\x03\x02\x01\x00\x00\xa0\x3f\xff'
+    ts, rest = TestStruct.deserialize(data)
+    assert rest == b'\xff'
+    assert isinstance(ts.a, t.uint8_t)
+    assert ts.a == 1
+    assert isinstance(ts.b, t.int16s)
+    assert ts.b == -2
+    assert ts.c == 0x01020304
+    assert ts.d == 1.25
+    assert ts.serialize() == data[:-1]
+
+
+def test_struct_variable_layout_codec():
+    class TestStruct(t.Struct):
+        _fields = [('a', t.uint8_t), ('b', t.LVBytes), ('c', t.uint24_t)]
+
+    assert TestStruct._struct_codec is None
+
+    ts, rest = TestStruct.deserialize(b'\x01\x02ab\x01\x02\x03')
+    assert rest == b''
+    assert ts.b == b'ab'
+    assert ts.c == 0x030201
+
+
+def test_struct_short_data_fallback():
+    class TestStruct(t.Struct):
+        _fields = [('a', t.uint8_t), ('b', t.uint16_t)]
+
+    ts, rest = TestStruct.deserialize(b'\x01\x02')
+    assert rest == b''
+    assert ts.a == 1
+    assert ts.b == 2
+
+
+def test_schema_codec_cached():
+    schema = (t.uint8_t, t.uint16_t)
+    codec = t.schema_codec(schema)
+    assert t.schema_codec(schema) is codec
+    assert t.schema_codec(list(schema)) is codec
+
+
+def test_schema_fixed_layout():
+    schema = (t.uint8_t, t.int16s, t.Bool)
+    data = b'\x01\xfe\xff\x01'
+    values, rest = t.deserialize(data + b'\xaa', schema)
+    assert rest == b'\xaa'
+    assert values == [1, -2, t.Bool.true]
+    assert [type(v) for v in values] == list(schema)
+    assert t.serialize([1, -2, True], schema) == data
+
+    # Short data falls back to the generic decoder
+    assert t.deserialize(b'\x01\x02', schema) == ([1, 2, t.Bool.false], b'')
+
+
+def test_serialize_schema():
+    schema = (t.uint8_t, t.LVBytes, t.LVList(t.uint16_t))
+    data = t.serialize([1, b'ab', [t.uint16_t(1), t.uint16_t(2)]], schema)
+    assert data == b'\x01\x02ab\x02\x01\x00\x02\x00'
+    assert t.serialize([], ()) == b''
+    assert t.deserialize(data, schema) == ([1, b'ab', [1, 2]], b'')
+
+
+class LegacyType:
+    """Implements only the original serialize()/deserialize() protocol"""
+    def __init__(self, value):
+        self.value = value
+
+    def serialize(self):
+        return bytes([self.value, self.value])
+
+    @classmethod
+    def deserialize(cls, data):
+        return cls(data[0]), data[2:]
+
+
+class LegacyUint8(t.uint8_t):
+    @classmethod
+    def deserialize(cls, data):
+        return cls(99), data[1:]
+
+
+def test_legacy_type_schema():
+    schema = (t.uint8_t, LegacyType)
+    data = t.serialize([1, LegacyType(5)], schema)
+    assert data == b'\x01\x05\x05'
+    (a, b), rest = t.deserialize(data + b'x', schema)
+    assert (a, b.value, rest) == (1, 5, b'x')
+
+    items, rest = t.LVList(LegacyType).deserialize(b'\x02\x01\x01\x02\x02')
+    assert [i.value for i in items] == [1, 2]
+    assert items.serialize() == b'\x02\x01\x01\x02\x02'
+
+
+def test_legacy_override():
+    assert t.deserialize(b'\x01\x02', (LegacyUint8, t.uint8_t))[0] == [99, 2]
+    assert t.NumericList(LegacyUint8).deserialize(b'\x01')[0] == [99]
+
+    class S(t.Struct):
+        _fields = [('a', LegacyUint8), ('b', t.uint8_t)]
+
+    class S2(t.Struct):
+        _fields = [('a', t.uint8_t)]
+
+        @classmethod
+        def deserialize(cls, data):
+            r = cls()
+            r.a = t.uint8_t(99)
+            return r, data[1:]
+
+    assert S._struct_codec is None
+    assert t.deserialize(b'\x01\x02', (S, ))[0][0].a == 99
+    assert t.deserialize(b'\x01', (S2, ))[0][0].a == 99
+
+
+def test_serialize_schema_short_data():
+    schema = (t.uint8_t, t.uint16_t)
+    assert t.serialize((1, ), schema) == b'\x01'
+    assert t.serialize((1, ), (t.uint8_t, t.LVBytes)) == b'\x01'
+
+
+def test_eui64():
+    ieee = t.EUI64(map(t.uint8_t, [0, 1, 2, 3, 4, 5, 6, 0xff]))
+    assert repr(ieee) == '00:01:02:03:04:05:06:ff'
+    assert str(ieee) == repr(ieee)
+    assert '%s' % (ieee, ) == repr(ieee)
+    assert len(ieee) == 8
+    assert ieee[0] == 0
+    assert ieee[7] == 0xff
+    assert isinstance(ieee[7], t.uint8_t)
+    assert ieee[::-1] == [0xff, 6, 5, 4, 3, 2, 1, 0]
+    assert list(ieee) == [0, 1, 2, 3, 4, 5, 6, 0xff]
+
+    ser = ieee.serialize()
+    assert ser == b'\xff\x06\x05\x04\x03\x02\x01\x00'
+    ieee2, rest = t.EUI64.deserialize(ser + b'\x01')
+    assert rest == b'\x01'
+    assert isinstance(ieee2, t.EUI64)
+    assert ieee2 == ieee
+    assert hash(ieee2) == hash(ieee)
+    assert {ieee: 1}[ieee2] == 1
+    assert hash(ieee) == hash(int(ieee))
+
+
+def test_eui64_list_equality():
+    ieee = t.EUI64([0, 1, 2, 3, 4, 5, 6, 7])
+    assert ieee == [0, 1, 2, 3, 4, 5, 6, 7]
+    assert [0, 1, 2, 3, 4, 5, 6, 7] == ieee
+    assert ieee != (0, 1, 2, 3, 4, 5, 6, 7)
+    assert ieee != [0, 1, 2, 3, 4, 5, 6, 8]
+    assert ieee != [0, 1, 2]
+    assert not ieee != [0, 1, 2, 3, 4, 5, 6, 7]
+    assert ieee != 'x'
+
+
+def test_eui64_int_semantics():
+    ieee = t.EUI64([0, 0, 0, 0, 0, 0, 0x12, 0x34])
+    assert ieee == 0x1234
+    assert 0x1234 == ieee
+    assert ieee != 0x1235
+    assert {0x1234: True}[ieee]
+    assert not t.EUI64([0] * 8)
+    assert ieee
+
+
+def test_eui64_convert():
+    ieee = t.EUI64.convert('00:0d:6f:00:0a:90:69:e7')
+    assert ieee == t.EUI64([0x00, 0x0d, 0x6f, 0x00, 0x0a, 0x90, 0x69, 0xe7])
+    assert t.EUI64.convert(repr(ieee).encode()) == ieee
+
+
+def test_eui64_invalid_length():
+    with pytest.raises(ValueError):
+        t.EUI64([1, 2, 3])
+
+
+def test_numeric_list():
+    cls = t.NumericList(t.uint16_t)
+    d, rest = cls.deserialize(b'\x01\x00\x02\x00\x03')
+    assert rest == b'\x03'
+    assert d == [1, 2]
+    assert [1, 2] == d
+    assert d != [1, 3]
+    assert repr(d) == '[1, 2]'
+    assert isinstance(d, cls)
+    assert d.serialize() == b'\x01\x00\x02\x00'
+    assert cls([t.uint16_t(1), 2]).serialize() == b'\x01\x00\x02\x00'
+
+
+def test_numeric_list_signed():
+    cls = t.NumericList(t.int16s)
+    d, rest = cls.deserialize(b'\xfe\xff\x02\x00')
+    assert rest == b''
+    assert d == [-2, 2]
+
+
+def test_lv_numeric_list():
+    cls = t.LVNumericList(t.uint16_t)
+    d, offset = cls.deserialize_from(b'\xff\x02\x01\x00\x02\x00\x03', 1)
+    assert offset == 6
+    assert d == [1, 2]
+    assert set(d) == {1, 2}
+    assert d.serialize() == b'\x02\x01\x00\x02\x00'
+    assert d == t.LVList(t.uint16_t).deserialize(d.serialize())[0]
+
+
+def test_numeric_list_copy():
+    cls = t.LVNumericList(t.uint16_t)
+    d = cls([1, 2])
+    for c in (copy.copy(d), copy.deepcopy(d)):
+        assert type(c) is cls
+        assert c == [1, 2]
+        assert c is not d
+        assert c.serialize() == b'\x02\x01\x00\x02\x00'
+
+
+def test_numeric_list_fallback():
+    d, rest = t.NumericList(t.uint24_t).deserialize(b'\x01\x02\x03')
+    assert type(d).__mro__[1:] == t.List(t.uint24_t).__mro__[1:]
+    assert isinstance(d[0], t.uint24_t)
+
+    d, rest = t.LVNumericList(t.Bool).deserialize(b'\x01\x01')
+    assert type(d).__mro__[1:] == t.LVList(t.Bool).__mro__[1:]
+    assert d == [t.Bool.true]
+
+
+def test_serialize_into():
+    buf = bytearray(b'\xff')
+    t.uint16_t(0x0102).serialize_into(buf)
+    t.LVBytes(b'ab').serialize_into(buf)
+    t.Single(1.25).serialize_into(buf)
+    t.LVList(t.uint8_t)([t.uint8_t(1), t.uint8_t(2)]).serialize_into(buf)
+    t.LVNumericList(t.uint16_t)([3]).serialize_into(buf)
+    t.EUI64.convert('00:01:02:03:04:05:06:07').serialize_into(buf)
+    assert buf == (
+        b'\xff\x02\x01\x02ab\x00\x00\xa0\x3f\x02\x01\x02\x01\x03\x00'
+        b'\x07\x06\x05\x04\x03\x02\x01\x00'
+    )
+
+
+def test_struct_serialize_into():
+    class Fixed(t.Struct):
+        _fields = [('a', t.uint8_t), ('b', t.uint16_t)]
+
+    class Variable(t.Struct):
+        _fields = [('a', Fixed), ('b', t.LVBytes)]
+
+    f = Fixed()
+    f.a = t.uint8_t(1)
+    f.b = t.uint16_t(2)
+    v = Variable()
+    v.a = f
+    v.b = t.LVBytes(b'x')
+
+    buf = bytearray(b'\xaa')
+    v.serialize_into(buf)
+    assert buf == b'\xaa\x01\x02\x00\x01x'
+    assert v.serialize() == b'\x01\x02\x00\x01x'
+
+
+def test_schema_serialize_into():
+    buf = bytearray(b'\x01')
+    t.serialize_into([2, 3], (t.uint8_t, t.uint16_t), buf)
+    t.serialize_into([b'a'], (t.LVBytes, ), buf)
+    assert buf == b'\x01\x02\x03\x00\x01a'
+
+
+def test_lazy_values():
+    schema = (t.uint8_t, t.LVBytes)
+    lazy = t.LazyValues(b'\xff\x01\x02ab', schema, 1)
+    assert lazy.decoded is False
+    assert len(lazy) == 2
+    assert lazy.decoded is False
+
+    assert lazy[0] == 1
+    assert lazy.decoded is True
+    assert lazy == [1, b'ab']
+    assert lazy != [1, b'ac']
+    assert list(lazy) == [1, b'ab']
+    assert repr(lazy) == "[1, b'ab']"
+    assert lazy == t.LazyValues(b'\x01\x02ab', schema)
+
+
+def test_struct_slots():
+    class TestStruct(t.Struct):
+        _fields = [('a', t.uint8_t), ('b', t.uint8_t)]
+
+    class SubStruct(TestStruct):
+        _fields = TestStruct._fields + [('c', t.uint8_t)]
+
+    assert TestStruct.__slots__ == ('a', 'b')
+    assert SubStruct.__slots__ == ('c', )
+
+    ts = SubStruct()
+    assert not hasattr(ts, '__dict__')
+    with pytest.raises(AttributeError):
+        ts.d = 1
+    ts.a, ts.b, ts.c = t.uint8_t(1), t.uint8_t(2), t.uint8_t(3)
+    assert SubStruct(ts).c == 3
+    assert repr(SubStruct()) == '<SubStruct a=None b=None c=None>'
@@ -1,7 +1,9 @@
+import asyncio
 from unittest import mock
 
 import pytest
 
+import zigpy.device
 import zigpy.endpoint
 import zigpy.types as t
 import zigpy.zcl as zcl
@@ -44,6 +46,25 @@ def test_deserialize_cluster_client(endpoint):
     assert args == [0x4241]
 
 
+def test_deserialize_lazy(endpoint):
+    tsn, command_id, is_reply, args = endpoint.deserialize(
+        3, b'\x09\x01\x00AB', lazy=True)
+    assert tsn == 1
+    assert command_id == 256
+    assert is_reply is True
+    assert isinstance(args, t.LazyValues)
+    assert args.decoded is False
+    assert args == [0x4241]
+    assert args.decoded is True
+
+
+def test_deserialize_lazy_unknown_command(endpoint):
+    tsn, command_id, is_reply, args = endpoint.deserialize(
+        0, b'\x01\x01\xff', lazy=True)
+    assert command_id == 255 + 256
+    assert args == b''
+
+
 def test_deserialize_cluster_unknown(endpoint):
     tsn, command_id, is_reply, args = endpoint.deserialize(0xff00, b'\x05\x00\x00\x01\x00')
     assert tsn == 1
@@ -74,10 +95,45 @@ def test_manufacturer_specific_cluster():
     assert hasattr(c, 'cluster_id')
 
 
+def test_cluster_range_index(caplog):
+    import zigpy.zcl.clusters.manufacturer_specific as ms
+
+    class TestRangeCluster(zcl.Cluster):
+        cluster_id_range = (0xfe00, 0xfe0f)
+
+    class TestOuterRangeCluster(zcl.Cluster):
+        cluster_id_range = (0x8000, 0x80ff)
+
+    class TestInnerRangeCluster(zcl.Cluster):
+        cluster_id_range = (0x8010, 0x801f)
+
+    try:
+        assert type(zcl.Cluster.from_id(None, 0xfe05)) is TestRangeCluster
+        assert type(zcl.Cluster.from_id(None, 0xfe10)) is ms.ManufacturerSpecificCluster
+        assert type(zcl.Cluster.from_id(None, 0x8005)) is TestOuterRangeCluster
+        assert type(zcl.Cluster.from_id(None, 0x8015)) is TestInnerRangeCluster
+        assert type(zcl.Cluster.from_id(None, 0x8020)) is TestOuterRangeCluster
+
+        caplog.clear()
+        for _ in range(3):
+            c = zcl.Cluster.from_id(None, 0x8100)
+            assert type(c) is zcl.Cluster
+            assert c.cluster_id == 0x8100
+        assert caplog.text.count("Unknown cluster") == 1
+    finally:
+        for cluster in (TestRangeCluster, TestOuterRangeCluster, TestInnerRangeCluster):
+            del zcl.Cluster._registry_range[cluster.cluster_id_range]
+        zcl.Cluster._index_registry_range()
+
+    assert type(zcl.Cluster.from_id(None, 0xfe05)) is ms.ManufacturerSpecificCluster
+    assert type(zcl.Cluster.from_id(None, 0x8005)) is zcl.Cluster
+
+
 @pytest.fixture
 def cluster():
     epmock = mock.MagicMock()
     epmock._device._application.get_sequence.return_value = 123
+    epmock.device.max_payload = zigpy.device.DEFAULT_MAX_PAYLOAD
     return zcl.Cluster.from_id(epmock, 0)
 
 
@@ -85,6 +141,7 @@ def cluster():
 def client_cluster():
     epmock = mock.MagicMock()
     epmock._device._application.get_sequence.return_value = 123
+    epmock.device.max_payload = zigpy.device.DEFAULT_MAX_PAYLOAD
     return zcl.Cluster.from_id(epmock, 3)
 
 
@@ -102,6 +159,13 @@ def test_request_manufacturer(cluster):
     assert org_size + 2 == len(cluster._endpoint.request.call_args[0][2])
 
 
+def test_request_frame(cluster):
+    cluster._endpoint._device.application.get_sequence.return_value = 123
+    cluster.request(True, 0, [t.uint8_t, t.uint16_t], 1, 2, manufacturer=0x1234)
+    data = cluster._endpoint.request.call_args[0][2]
+    assert data == b'\x04\x34\x12\x7b\x00\x01\x02\x00'
+
+
 def test_reply_general(cluster):
     cluster.reply(False, 0, [])
     assert cluster._endpoint.reply.call_count == 1
@@ -125,6 +189,21 @@ def test_attribute_report(cluster):
     assert cluster._attr_cache[4] == 1
 
 
+def test_attribute_report_deserialize(endpoint):
+    frame = b'\x18\x01\x0a\x00\x00\x20\x99\x05\x00\x42\x02ab'
+    tsn, command_id, is_reply, args = endpoint.deserialize(0, frame)
+    assert command_id == 0x0a
+    assert is_reply is False
+    assert args == [[(0, 0x20, 0x99), (5, 0x42, b'ab')]]
+
+    cluster = endpoint.in_clusters[0]
+    listener = mock.MagicMock()
+    cluster.add_listener(listener)
+    cluster.handle_message(is_reply, tsn, command_id, args)
+    assert cluster._attr_cache == {0: 0x99, 5: b'ab'}
+    assert listener.attribute_updated.call_count == 2
+
+
 def test_handle_request_unknown(cluster):
     cluster.handle_message(False, 0, 0xff, [])
 
@@ -235,11 +314,300 @@ async def test_item_access_attributes(cluster):
         v = await cluster[99]
 
 
+@pytest.mark.asyncio
+async def test_read_attributes_max_age(monkeypatch, cluster):
+    requests = []
+
+    async def mockrequest(foundation, command, schema, args, manufacturer=None):
+        requests.append(list(args))
+        return [[_mk_rar(attrid, attrid + 100) for attrid in args]]
+
+    now = 1000.0
+    monkeypatch.setattr(zcl.time, 'time', lambda: now)
+    cluster.request = mockrequest
+    cluster._update_attribute(0, 1)
+    cluster._attr_cache[4] = b'Manufacturer'  # Unknown age
+    now += 60
+
+    success, _ = await cluster.read_attributes([0, 4, 5], max_age=120)
+    assert requests == [[4, 5]]
+    assert success == {0: 1, 4: 104, 5: 105}
+    assert cluster.attr_cache_stats == {'hit': 1, 'stale': 1, 'miss': 1}
+
+    requests.clear()
+    success, _ = await cluster.read_attributes([0, 4], max_age=30)
+    assert requests == [[0]]
+    assert success == {0: 100, 4: 104}
+
+    requests.clear()
+    cluster.cache_max_age = 0
+    now += 1
+    assert await cluster['zcl_version'] == 100
+    assert requests == [[0]]
+
+
+def test_attribute_cache_source(monkeypatch, cluster):
+    monkeypatch.setattr(zcl.time, 'time', lambda: 1000.0)
+    cluster._update_attribute(0, 1)
+    cluster._cache_attribute(5, b'Model', zcl.AttributeSource.DB)
+    cluster.handle_message(False, 0, 0x0a, [zcl.foundation.AttributeReportList([(4, 0x20, 1)])])
+    cluster._attr_cache[6] = 2
+
+    monkeypatch.setattr(zcl.time, 'time', lambda: 1010.0)
+    assert cluster.cache_freshness() == {
+        0: (10.0, zcl.AttributeSource.READ),
+        4: (10.0, zcl.AttributeSource.REPORT),
+        5: (None, zcl.AttributeSource.DB),
+        6: (None, None),
+    }
+    assert cluster._update_source is zcl.AttributeSource.READ
+
+
+@pytest.mark.asyncio
+async def test_read_attributes_coalesced(cluster):
+    requests = []
+
+    async def mockrequest(foundation, command, schema, args, manufacturer=None):
+        requests.append(list(args))
+        return [[_mk_rar(attrid, attrid + 100) for attrid in args if attrid != 3] +
+                [_mk_rar(3, None, 0x86)]]
+
+    cluster.request = mockrequest
+    listener = mock.MagicMock()
+    cluster.add_listener(listener)
+    r1, r2, r3 = await asyncio.gather(
+        cluster.read_attributes([0, 1]),
+        cluster.read_attributes([1, 2, 3]),
+        cluster.read_attributes([4], manufacturer=0x1234),
+    )
+    assert requests == [[0, 1, 2, 3], [4]]
+    assert r1 == ({0: 100, 1: 101}, {})
+    assert r2 == ({1: 101, 2: 102}, {3: 0x86})
+    assert r3 == ({4: 104}, {})
+    assert listener.attribute_updated.call_count == 4
+
+
+@pytest.mark.asyncio
+async def test_read_attributes_coalesced_cancelled(cluster):
+    async def cancelled(attribute_ids, manufacturer=None):
+        raise asyncio.CancelledError
+
+    cluster._read_attributes_chunked = cancelled
+    with pytest.raises(asyncio.CancelledError):
+        await asyncio.wait_for(cluster.read_attributes([0, 1]), 1)
+    assert cluster._read_batches == {}
+
+
+@pytest.mark.asyncio
+async def test_read_attributes_coalesced_chunks(cluster):
+    requests = []
+
+    async def mockrequest(foundation, command, schema, args, manufacturer=None):
+        requests.append(list(args))
+        if 0 in args:
+            raise asyncio.TimeoutError
+        return [[_mk_rar(attrid, attrid) for attrid in args]]
+
+    cluster.request = mockrequest
+    cluster.read_batch_max_attributes = 2
+    r1, r2 = await asyncio.gather(
+        cluster.read_attributes([0, 1]),
+        cluster.read_attributes([2, 3, 4]),
+        return_exceptions=True,
+    )
+    assert requests == [[0, 1], [2, 3], [4]]
+    assert isinstance(r1, asyncio.TimeoutError)
+    assert r2 == ({2: 2, 3: 3, 4: 4}, {})
+
+
+@pytest.mark.asyncio
+async def test_request_single_flight(cluster):
+    pending = []
+
+    def mockrequest(cluster_id, sequence, data, expect_reply=True):
+        pending.append(asyncio.Future())
+        return pending[-1]
+
+    cluster._endpoint.request.side_effect = mockrequest
+    schema = zcl.foundation.COMMANDS[0x0c][1]
+    with mock.patch.object(t, 'serialize_into', wraps=t.serialize_into) as spy:
+        r1 = cluster.request(True, 0x0c, schema, 0, 16)
+    # The payload serialized for the key is reused in the frame
+    assert spy.call_count == 0
+    assert cluster._endpoint.request.call_args[0][2][2:] == b'\x0c\x00\x00\x10'
+    r2 = cluster.request(True, 0x0c, schema, 0, 16)
+    r3 = cluster.request(True, 0x0c, schema, 0, 8)
+    r4 = cluster.request(True, 0x0c, schema, 0, 16, manufacturer=0x1234)
+    assert len(pending) == 3
+
+    r1.cancel()
+    pending[0].set_result(mock.sentinel.result)
+    assert await r2 is mock.sentinel.result
+    for future in pending[1:]:
+        future.set_result(None)
+    await asyncio.gather(r3, r4)
+
+    # Finished requests are no longer shared
+    cluster.request(True, 0x0c, schema, 0, 16)
+    assert len(pending) == 4
+    pending[-1].set_result(None)
+
+
+@pytest.mark.asyncio
+async def test_request_single_flight_error(cluster):
+    future = asyncio.Future()
+    cluster._endpoint.request.return_value = future
+    schema = zcl.foundation.COMMANDS[0x00][1]
+    r1 = cluster.request(True, 0x00, schema, [0, 1])
+    r2 = cluster.request(True, 0x00, schema, [0, 1])
+    future.set_exception(asyncio.TimeoutError())
+    with pytest.raises(asyncio.TimeoutError):
+        await r1
+    with pytest.raises(asyncio.TimeoutError):
+        await r2
+    assert cluster._endpoint.request.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_request_not_idempotent(cluster):
+    future = asyncio.Future()
+    cluster._endpoint.request.return_value = future
+    cluster.request(True, 0x02, [t.uint8_t], 1)
+    cluster.request(True, 0x02, [t.uint8_t], 1)
+    cluster.request(False, 0x00, [t.uint8_t], 1)
+    cluster.request(False, 0x00, [t.uint8_t], 1)
+    assert cluster._endpoint.request.call_count == 4
+    assert cluster._inflight == {}
+
+
 def test_write_attributes(cluster):
     cluster.write_attributes({0: 5, 'app_version': 4})
     assert cluster._endpoint.request.call_count == 1
 
 
+def test_split_records(cluster):
+    cluster._endpoint.device.max_payload = 9
+    records = []
+    for attrid in range(5):
+        record = zcl.foundation.ReadReportingConfigRecord()
+        record.direction = 0
+        record.attrid = attrid
+        records.append(record)
+    # Fixed layout records are measured without serializing them
+    with mock.patch.object(t.Struct, 'serialize_into', side_effect=AssertionError):
+        chunks = cluster._split_records(records)
+    assert [[r.attrid for r in chunk] for chunk in chunks] == [[0, 1], [2, 3], [4]]
+
+    attrs = []
+    for attrid in range(3):
+        attr = zcl.foundation.Attribute()
+        attr.attrid = t.uint16_t(attrid)
+        attr.value = zcl.foundation.TypeValue()
+        attr.value.type = t.uint8_t(0x42)
+        attr.value.value = t.LVBytes(b'a' * attrid)
+        attrs.append(attr)
+    # 4, 5 and 6 bytes
+    chunks = cluster._split_records(attrs)
+    assert [[r.attrid for r in chunk] for chunk in chunks] == [[0], [1], [2]]
+    cluster._endpoint.device.max_payload = 12
+    chunks = cluster._split_records(attrs)
+    assert [[r.attrid for r in chunk] for chunk in chunks] == [[0, 1], [2]]
+
+
+def test_write_attributes_undivided(cluster):
+    with mock.patch.object(cluster, 'request') as request:
+        cluster.write_attributes(
+            {0: 5, 'app_version': 4}, mode=zcl.foundation.WriteMode.UNDIVIDED)
+    assert request.call_count == 1
+    assert request.call_args[0][1] == 0x03
+
+
+@pytest.mark.asyncio
+async def test_write_attributes_undivided_too_large(cluster):
+    cluster._endpoint.device.max_payload = 10
+    with mock.patch.object(cluster, 'request') as request:
+        with pytest.raises(ValueError):
+            await cluster.write_attributes(
+                {0: 5, 1: 4, 2: 3}, mode=zcl.foundation.WriteMode.UNDIVIDED)
+    assert request.call_count == 0
+
+
+@pytest.mark.asyncio
+async def test_write_attributes_no_response(cluster):
+    cluster._endpoint.device.max_payload = 15
+    requests = []
+
+    async def mockrequest(foundation, command, schema, args, manufacturer=None,
+                          expect_reply=True):
+        requests.append((command, expect_reply, [a.attrid for a in args]))
+
+    cluster.request = mockrequest
+    # Each uint8 attribute takes 4 bytes, three of them fit in a frame
+    await cluster.write_attributes(
+        {0: 5, 1: 4, 2: 3, 3: 2}, mode=zcl.foundation.WriteMode.NO_RESPONSE)
+    assert requests == [(0x05, False, [0, 1, 2]), (0x05, False, [3])]
+
+    await cluster.write_attributes(
+        {0: 1}, mode=zcl.foundation.WriteMode.NO_RESPONSE)
+    assert requests[-1] == (0x05, False, [0])
+
+
+@pytest.mark.asyncio
+async def test_write_attributes_split(cluster):
+    cluster._endpoint.device.max_payload = 15
+    cluster._endpoint.device.request_window = asyncio.Semaphore(2)
+    requests = []
+    active = []
+
+    async def mockrequest(foundation, command, schema, args, manufacturer=None):
+        requests.append([a.attrid for a in args])
+        active.append(len(requests))
+        assert len(active) <= 2
+        await asyncio.sleep(0)
+        active.pop()
+        rec = zcl.foundation.WriteAttributesStatusRecord()
+        if all(a.attrid != 4 for a in args):
+            rec.status = zcl.foundation.Status.SUCCESS
+            return [[rec]]
+        rec.status = zcl.foundation.Status.READ_ONLY
+        rec.attrid = 4
+        return [[rec]]
+
+    cluster.request = mockrequest
+    # Each uint8 attribute is 4 bytes, three of them fit in a frame
+    attributes = {attrid: 1 for attrid in (0, 1, 2, 3, 4, 5, 6)}
+    cluster.attributes = {attrid: ('attr%d' % attrid, t.uint8_t) for attrid in attributes}
+    result = await cluster.write_attributes(attributes)
+    assert requests == [[0, 1, 2], [3, 4, 5], [6]]
+    assert len(result[0]) == 1
+    assert result[0][0].attrid == 4
+
+    requests.clear()
+    del attributes[4]
+    result = await cluster.write_attributes(attributes)
+    assert len(requests) == 2
+    assert result[0][0].status == zcl.foundation.Status.SUCCESS
+
+
+@pytest.mark.asyncio
+async def test_read_attributes_split(cluster):
+    cluster._endpoint.device.max_payload = 11
+    requests = []
+
+    async def mockrequest(foundation, command, schema, args, manufacturer=None):
+        requests.append(list(args))
+        return [[_mk_rar(attrid, attrid) for attrid in args]]
+
+    cluster.request = mockrequest
+    success, failure = await cluster.read_attributes([0, 1, 2, 3, 4, 5])
+    assert requests == [[0, 1, 2, 3], [4, 5]]
+    assert success == {0: 0, 1: 1, 2: 2, 3: 3, 4: 4, 5: 5}
+
+    requests.clear()
+    await cluster.read_attributes([0, 1, 2], allow_cache=False, manufacturer=0x1234)
+    assert requests == [[0, 1, 2]]
+
+
 def test_write_wrong_attribute(cluster):
     cluster.write_attributes({0xff: 5})
     assert cluster._endpoint.request.call_count == 1
@@ -300,6 +668,167 @@ def test_configure_reporting_manuf():
     assert cluster.request.call_count == 1
 
 
+@pytest.mark.asyncio
+async def test_configure_reporting_multiple(cluster):
+    requests = []
+
+    def _mk_status(status, attrid=0):
+        record = zcl.foundation.ConfigureReportingResponseRecord()
+        record.status = status
+        record.direction = 0
+        record.attrid = attrid
+        return record
+
+    async def mockrequest(foundation, command, schema, args, manufacturer=None):
+        assert command == 0x06
+        attrids = [cfg.attrid for cfg in args]
+        requests.append(attrids)
+        if 7 in attrids:
+            return [command, zcl.foundation.Status.UNSUP_GENERAL_COMMAND]
+        if 1 in attrids:
+            return [[_mk_status(0x86, 1)]]
+        return [[_mk_status(0)]]
+
+    cluster.request = mockrequest
+    # Each uint8 attribute config takes 9 bytes, two of them fit in a frame
+    cluster._endpoint.device.max_payload = 21
+    result = await cluster.configure_reporting_multiple({
+        'zcl_version': (1, 300, 1),
+        1: (1, 300, 1),
+        2: (1, 300, 1),
+        3: (1, 300, 1),
+        7: (1, 300, 1),
+        'wrong_attr_name': (1, 300, 1),
+    })
+    assert requests == [[0, 1], [2, 3], [7]]
+    assert result == {
+        'zcl_version': zcl.foundation.Status.SUCCESS,
+        1: zcl.foundation.Status.UNSUPPORTED_ATTRIBUTE,
+        2: zcl.foundation.Status.SUCCESS,
+        3: zcl.foundation.Status.SUCCESS,
+        7: zcl.foundation.Status.UNSUP_GENERAL_COMMAND,
+        'wrong_attr_name': zcl.foundation.Status.UNSUPPORTED_ATTRIBUTE,
+    }
+
+
+@pytest.mark.asyncio
+async def test_configure_reporting_applied(cluster):
+    async def mockrequest(foundation, command, schema, args, manufacturer=None):
+        record = zcl.foundation.ConfigureReportingResponseRecord()
+        record.status = 0x86 if args[0].attrid == 1 else 0
+        record.direction = 0
+        record.attrid = args[0].attrid
+        return [[record]]
+
+    cluster.request = mockrequest
+    listener = mock.MagicMock()
+    cluster.add_listener(listener)
+    await cluster.configure_reporting('zcl_version', 1, 300, 1)
+    await cluster.configure_reporting(1, 1, 300, 1)
+    assert cluster._applied_reporting == {0: (1, 300, 1)}
+    listener.reporting_configured.assert_called_once_with(0, 1, 300, 1)
+
+
+def _mk_reporting_rsp(attrid, min_interval, max_interval, change, status=0):
+    record = zcl.foundation.ReadReportingConfigResponseRecord()
+    record.status = zcl.foundation.Status(status)
+    record.direction = 0
+    record.attrid = attrid
+    if status == 0:
+        record.datatype = 0x20
+        record.min_interval = min_interval
+        record.max_interval = max_interval
+        record.reportable_change = change
+    return record
+
+
+@pytest.mark.asyncio
+async def test_reconcile_reporting(cluster):
+    device_config = {
+        0: (1, 300, 1),
+        1: (1, 600, 1),
+    }
+    requests = []
+
+    async def mockrequest(foundation, command, schema, args, manufacturer=None):
+        requests.append((command, [record.attrid for record in args]))
+        if command == 0x08:
+            return [[
+                _mk_reporting_rsp(r.attrid, *device_config[r.attrid])
+                if r.attrid in device_config else
+                _mk_reporting_rsp(r.attrid, None, None, None, 0x8b)
+                for r in args
+            ]]
+        record = zcl.foundation.ConfigureReportingResponseRecord()
+        record.status = 0
+        return [[record]]
+
+    cluster.request = mockrequest
+    listener = mock.MagicMock()
+    cluster.add_listener(listener)
+    wanted = {
+        'zcl_version': (1, 300, 1),
+        'app_version': (1, 300, 1),
+        2: (1, 300, 1),
+        'wrong_attr_name': (1, 300, 1),
+    }
+    result = await cluster.reconcile_reporting(wanted)
+    assert requests == [(0x08, [0, 1, 2]), (0x06, [1, 2])]
+    assert result == {
+        'zcl_version': zcl.foundation.Status.SUCCESS,
+        'app_version': zcl.foundation.Status.SUCCESS,
+        2: zcl.foundation.Status.SUCCESS,
+        'wrong_attr_name': zcl.foundation.Status.UNSUPPORTED_ATTRIBUTE,
+    }
+    assert cluster._applied_reporting == {
+        0: (1, 300, 1), 1: (1, 300, 1), 2: (1, 300, 1),
+    }
+    assert listener.reporting_configured.call_count == 3
+
+    # Nothing to send when the applied configuration is trusted
+    requests.clear()
+    del wanted['wrong_attr_name']
+    result = await cluster.reconcile_reporting(wanted, read_device=False)
+    assert requests == []
+    wanted[3] = (1, 300, 1)
+    result = await cluster.reconcile_reporting(wanted, read_device=False)
+    assert requests == [(0x06, [3])]
+
+
+@pytest.mark.asyncio
+async def test_read_reporting_configuration_default_response(cluster):
+    async def mockrequest(foundation, command, schema, args, manufacturer=None):
+        return [command, zcl.foundation.Status.UNSUP_GENERAL_COMMAND]
+
+    cluster.request = mockrequest
+    result = await cluster.read_reporting_configuration(['zcl_version', 1])
+    assert result == {
+        'zcl_version': zcl.foundation.Status.UNSUP_GENERAL_COMMAND,
+        1: zcl.foundation.Status.UNSUP_GENERAL_COMMAND,
+    }
+
+
+@pytest.mark.asyncio
+async def test_read_reporting_configuration_not_applied(cluster):
+    async def mockrequest(foundation, command, schema, args, manufacturer=None):
+        return [[_mk_reporting_rsp(0, 1, 600, 1)]]
+
+    cluster.request = mockrequest
+    result = await cluster.read_reporting_configuration(['zcl_version'])
+    assert result['zcl_version'].max_interval == 600
+    assert cluster._applied_reporting == {}
+
+
+def test_reporting_configured_optional_listener(cluster, caplog):
+    class Listener:
+        pass
+
+    cluster.add_listener(Listener())
+    cluster._update_applied_reporting(cluster._reporting_config(0, 1, 300, 1))
+    assert cluster._applied_reporting == {0: (1, 300, 1)}
+    assert 'reporting_configured' not in caplog.text
+
+
 def test_command(cluster):
     cluster.command(0x00)
     assert cluster._endpoint.request.call_count == 1
@@ -320,6 +849,49 @@ def test_command_invalid_attr(cluster):
         cluster.no_such_command()
 
 
+def test_command_methods(cluster):
+    assert 'reset_fact_default' in type(cluster).__dict__
+    assert type(cluster).reset_fact_default.__name__ == 'reset_fact_default'
+    cluster.reset_fact_default(manufacturer=0x1234, expect_reply=False)
+    assert cluster._endpoint.request.call_args[1] == {'expect_reply': False}
+    assert cluster._endpoint.request.call_args[0][2][:3] == b'\x05\x34\x12'
+
+
+def test_command_methods_subclass():
+    class TestCluster(zcl.Cluster):
+        cluster_id = 0xfc00
+        server_commands = {
+            0x00: ('first', (t.uint8_t, ), False),
+            0x01: ('bind', (), False),
+        }
+        client_commands = {
+            0x00: ('first', (t.uint16_t, ), True),
+            0x01: ('second', (), True),
+        }
+
+    class TestSubCluster(TestCluster):
+        cluster_id = 0xfc01
+        server_commands = {}
+        client_commands = {
+            0x02: ('second', (), True),
+        }
+
+    assert TestCluster.bind is zcl.Cluster.bind
+
+    cluster = TestCluster(mock.MagicMock())
+    cluster.first(0x1234)
+    assert cluster._endpoint.reply.call_args[0][2][-2:] == b'\x34\x12'
+
+    cluster = TestSubCluster(mock.MagicMock())
+    cluster.second()
+    assert cluster._endpoint.reply.call_args[0][2][-1] == 0x02
+    with pytest.raises(AttributeError):
+        cluster.first()
+    assert not hasattr(cluster, 'first')
+    zcl.Cluster._registry.pop(0xfc00)
+    zcl.Cluster._registry.pop(0xfc01)
+
+
 def test_invalid_arguments_cluster_command(cluster):
     res = cluster.command(0x00, 1)
     assert type(res.exception()) == ValueError
@@ -347,3 +919,115 @@ def test_discover(cluster):
     assert cluster.request.call_count == 1
     cluster.request.assert_called_with(
         True, cmd_id, mock.ANY, s.start, s.items, manufacturer=s.manuf)
+
+
+def _mk_discover_rsp(attrids):
+    records = []
+    for attrid in attrids:
+        record = zcl.foundation.DiscoverAttributesResponseRecord()
+        record.attrid = attrid
+        record.datatype = 0x20
+        records.append(record)
+    return records
+
+
+async def _collect(iterator):
+    records = []
+    async for record in iterator:
+        records.append(record)
+    return records
+
+
+@pytest.mark.asyncio
+async def test_discover_all_attributes(cluster):
+    attrids = [0, 1, 2, 3, 4, 7, 0x4000]
+    requests = []
+
+    async def mockrequest(foundation, cmd_id, schema, start, count, manufacturer=None):
+        requests.append((cmd_id, start, count))
+        found = [attrid for attrid in attrids if attrid >= start]
+        return [t.Bool(len(found) <= count), _mk_discover_rsp(found[:count])]
+
+    cluster.request = mockrequest
+    cluster._endpoint.device.max_payload = 13  # 3 records per page
+    discovered = []
+    async for record in cluster.discover_all_attributes():
+        discovered.append(record.attrid)
+        if len(discovered) == 1:
+            # The second page is requested before the first is consumed
+            await asyncio.sleep(0)
+            assert len(requests) == 2
+    assert discovered == attrids
+    assert requests == [(0x0c, 0, 3), (0x0c, 3, 3), (0x0c, 8, 3)]
+
+    # Answered locally from now on
+    discovered = await _collect(cluster.discover_all_attributes())
+    assert [r.attrid for r in discovered] == attrids
+    complete, records = await cluster.discover_attributes(2, 3)
+    assert complete == t.Bool.false
+    assert [r.attrid for r in records] == [2, 3, 4]
+    complete, records = await cluster.discover_attributes(4, 3)
+    assert complete == t.Bool.true
+    assert [r.attrid for r in records] == [4, 7, 0x4000]
+    assert len(requests) == 3
+
+    # Discovery results are per manufacturer, whose header leaves room
+    # for 2 records per page
+    discovered = await _collect(cluster.discover_all_attributes(manufacturer=0x1234))
+    assert len(discovered) == len(attrids)
+    assert requests[3:] == [(0x0c, 0, 2), (0x0c, 2, 2), (0x0c, 4, 2), (0x0c, 8, 2)]
+
+
+@pytest.mark.asyncio
+async def test_discover_all_commands_unsupported(cluster):
+    async def mockrequest(foundation, cmd_id, schema, start, count, manufacturer=None):
+        return [cmd_id, zcl.foundation.Status.UNSUP_GENERAL_COMMAND]
+
+    cluster.request = mockrequest
+    assert await _collect(cluster.discover_all_commands_received()) == []
+    assert cluster._discovered == {}
+
+
+@pytest.mark.asyncio
+async def test_read_attributes_structured(cluster):
+    async def mockrequest(foundation, command, schema, args, manufacturer=None):
+        assert command == 0x0e
+        if args[0].attrid == 2:
+            return [command, zcl.foundation.Status.UNSUP_GENERAL_COMMAND]
+        records = []
+        for i, record in enumerate(args):
+            rar = zcl.foundation.ReadAttributeRecord()
+            rar.attrid = record.attrid
+            rar.status = zcl.foundation.Status.INVALID_SELECTOR if i else 0
+            rar.value = zcl.foundation.TypeValue()
+            rar.value.value = record.selector.indices[-1]
+            records.append(rar)
+        return [records]
+
+    cluster.request = mockrequest
+    selector = zcl.foundation.Selector([1, 2])
+    success, failure = await cluster.read_attributes_structured(
+        [('zcl_version', 4), (1, selector)])
+    assert success == {('zcl_version', 4): 4}
+    assert failure == {(1, selector): zcl.foundation.Status.INVALID_SELECTOR}
+
+    success, failure = await cluster.read_attributes_structured([(2, 1)])
+    assert success == {}
+    assert failure == {(2, 1): zcl.foundation.Status.UNSUP_GENERAL_COMMAND}
+
+
+def test_write_attributes_structured(cluster):
+    with mock.patch.object(cluster, 'request') as request:
+        cluster.write_attributes_structured({
+            ('zcl_version', (1, 2)): t.uint8_t(5),
+        })
+    assert request.call_count == 1
+    assert request.call_args[0][1] == 0x0f
+    record = request.call_args[0][3][0]
+    assert record.attrid == 0
+    assert record.selector.indices == [1, 2]
+    assert record.value.type == 0x20
+    assert record.value.value == 5
+
+    with pytest.raises(ValueError):
+        cluster.write_attributes_structured({(0, 1): 5})
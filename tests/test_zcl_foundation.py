@@ -1,3 +1,5 @@
+import pytest
+
 import zigpy.types as t
 from zigpy.zcl import foundation
 
@@ -76,3 +78,119 @@ def test_typed_collection():
 
     assert tc2.type == 0x20
     assert tc2.value == list(range(100))
+
+
+def test_read_attribute_record_deserialize_from():
+    data = b'\xff\x01\x00\x00\x21\x02\x01\x02\x00\x86'
+    rar, offset = foundation.ReadAttributeRecord.deserialize_from(data, 1)
+    assert offset == 7
+    assert rar.attrid == 1
+    assert rar.value.value == 0x0102
+
+    rar, offset = foundation.ReadAttributeRecord.deserialize_from(data, offset)
+    assert offset == len(data)
+    assert rar.attrid == 2
+    assert rar.status == 0x86
+
+
+def test_serialize_into():
+    rar, _ = foundation.ReadAttributeRecord.deserialize(b'\x01\x00\x00\x20\x99')
+    arc = foundation.AttributeReportingConfig()
+    arc.direction = 1
+    arc.attrid = 99
+    arc.timeout = 0x7e
+
+    buf = bytearray(b'\xff')
+    rar.serialize_into(buf)
+    arc.serialize_into(buf)
+    rar.value.serialize_into(buf)
+    assert buf == b'\xff\x01\x00\x00\x20\x99\x01\x63\x00\x7e\x00\x20\x99'
+
+
+def test_attribute_report_list():
+    data = b'\x00\x00\x20\x99\x05\x00\x42\x02ab'
+    records, rest = foundation.AttributeReportList.deserialize(data)
+    assert rest == b''
+    assert records == [(0, 0x20, 0x99), (5, 0x42, b'ab')]
+    assert isinstance(records[0][2], t.uint8_t)
+    assert str(records) == "0=153, 5=b'ab'"
+    assert records.serialize() == data
+
+
+def test_attribute_report_list_serialize_attribute():
+    attr = foundation.Attribute()
+    attr.attrid = t.uint16_t(1)
+    attr.value = foundation.TypeValue()
+    attr.value.type = 0x21
+    attr.value.value = t.uint16_t(2)
+    records = foundation.AttributeReportList([attr, (3, 0x20, 4)])
+    assert records.serialize() == b'\x01\x00\x21\x02\x00\x03\x00\x20\x04'
+
+
+def test_record_slots():
+    for cls in (foundation.TypeValue, foundation.TypedCollection,
+                foundation.ReadAttributeRecord,
+                foundation.AttributeReportingConfig, foundation.Attribute):
+        assert not hasattr(cls(), '__dict__')
+
+
+def test_read_reporting_config_response_record():
+    data = b'\x00\x00\x05\x00\x21\x01\x00\x2c\x01\x0a\x00\x86\x00\x06\x00'
+    schema = foundation.COMMANDS[0x09][1]
+    (records, ), rest = t.deserialize(data, schema)
+    assert rest == b''
+    assert records[0].status == foundation.Status.SUCCESS
+    assert records[0].attrid == 5
+    assert records[0].min_interval == 1
+    assert records[0].max_interval == 300
+    assert records[0].reportable_change == 10
+    assert records[1].status == foundation.Status.UNSUPPORTED_ATTRIBUTE
+    assert records[1].attrid == 6
+    assert t.serialize((records, ), schema) == data
+
+
+def test_selector():
+    selector = foundation.Selector([2, 1], foundation.SelectorMode.ADD)
+    assert selector.serialize() == b'\x12\x02\x00\x01\x00'
+    decoded, rest = foundation.Selector.deserialize(selector.serialize() + b'x')
+    assert rest == b'x'
+    assert decoded == selector
+    assert foundation.Selector().serialize() == b'\x00'
+    with pytest.raises(ValueError):
+        foundation.Selector(range(16)).serialize()
+
+
+def test_write_attribute_structured_records():
+    record = foundation.WriteAttributeStructuredRecord()
+    record.attrid = t.uint16_t(0x0010)
+    record.selector = foundation.Selector([3])
+    record.value = foundation.TypeValue()
+    record.value.type = t.uint8_t(0x20)
+    record.value.value = t.uint8_t(7)
+    data = record.serialize()
+    assert data == b'\x10\x00\x01\x03\x00\x20\x07'
+    decoded, rest = foundation.WriteAttributeStructuredRecord.deserialize(data)
+    assert rest == b''
+    assert decoded.selector == record.selector
+    assert decoded.value.value == 7
+
+    schema = foundation.COMMANDS[0x10][1]
+    (records, ), rest = t.deserialize(b'\x00', schema)
+    assert records[0].status == foundation.Status.SUCCESS
+    data = b'\x87\x10\x00\x01\x03\x00'
+    (records, ), rest = t.deserialize(data, schema)
+    assert rest == b''
+    assert records[0].status == foundation.Status.INVALID_VALUE
+    assert records[0].attrid == 0x0010
+    assert records[0].selector == foundation.Selector([3])
+    assert t.serialize((records, ), schema) == data
+
+
+def test_long_string_type_value():
+    data = b'\x43\x03\x00abc'
+    tv, rest = foundation.TypeValue.deserialize(data)
+    assert rest == b''
+    assert isinstance(tv.value, t.LongOctetString)
+    assert tv.value == b'abc'
+    assert tv.serialize() == data
+    assert foundation.DATA_TYPE_IDX[t.LongCharacterString] == 0x44
@@ -67,3 +67,12 @@ def test_size_prefixed_simple_descriptor():
 def test_empty_size_prefixed_simple_descriptor():
     r = types.SizePrefixedSimpleDescriptor.deserialize(b'\x00')
     assert r == (None, b'')
+
+
+def test_multi_address_serialize_into():
+    ma = types.MultiAddress()
+    ma.addrmode = 1
+    ma.nwk = 0x1234
+    buf = bytearray(b'\xff')
+    ma.serialize_into(buf)
+    assert buf == b'\xff\x01\x34\x12'
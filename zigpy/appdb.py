@@ -6,6 +6,8 @@ import zigpy.endpoint
 import zigpy.profiles
 import zigpy.quirks
 import zigpy.types as t
+import zigpy.zdo.types
+from zigpy.zcl import AttributeSource
 from zigpy.zcl.clusters.general import Basic
 
 
@@ -17,10 +19,7 @@ def _sqlite_adapters():
         return repr(eui64)
     sqlite3.register_adapter(t.EUI64, adapt_ieee)
 
-    def convert_ieee(s):
-        ieee = [t.uint8_t(p, base=16) for p in s.split(b':')]
-        return t.EUI64(ieee)
-    sqlite3.register_converter("ieee", convert_ieee)
+    sqlite3.register_converter("ieee", t.EUI64.convert)
 
 
 class PersistingListener:
@@ -32,10 +31,12 @@ class PersistingListener:
         self._cursor = self._db.cursor()
 
         self._create_table_devices()
+        self._create_table_node_descriptors()
         self._create_table_endpoints()
         self._create_table_clusters()
         self._create_table_output_clusters()
         self._create_table_attributes()
+        self._create_table_reporting_config()
 
         self._application = application
 
@@ -66,6 +67,20 @@ class PersistingListener:
             value,
         )
 
+    def reporting_configured(self, cluster, attrid, min_interval, max_interval,
+                             reportable_change):
+        q = "INSERT OR REPLACE INTO reporting_config VALUES (?, ?, ?, ?, ?, ?, ?)"
+        self.execute(q, (
+            cluster.endpoint.device.ieee,
+            cluster.endpoint.endpoint_id,
+            cluster.cluster_id,
+            attrid,
+            min_interval,
+            max_interval,
+            reportable_change,
+        ))
+        self._db.commit()
+
     def _create_table(self, table_name, spec):
         self.execute("CREATE TABLE IF NOT EXISTS %s %s" % (table_name, spec))
 
@@ -78,6 +93,10 @@ class PersistingListener:
         self._create_table("devices", "(ieee ieee, nwk, status)")
         self._create_index("ieee_idx", "devices", "ieee")
 
+    def _create_table_node_descriptors(self):
+        self._create_table("node_descriptors", "(ieee ieee, value)")
+        self._create_index("node_descriptors_idx", "node_descriptors", "ieee")
+
     def _create_table_endpoints(self):
         self._create_table(
             "endpoints",
@@ -112,8 +131,21 @@ class PersistingListener:
             "ieee, endpoint_id, cluster, attrid"
         )
 
+    def _create_table_reporting_config(self):
+        self._create_table(
+            "reporting_config",
+            "(ieee ieee, endpoint_id, cluster, attrid, min_interval, max_interval, reportable_change)",
+        )
+        self._create_index(
+            "reporting_config_idx",
+            "reporting_config",
+            "ieee, endpoint_id, cluster, attrid"
+        )
+
     def _remove_device(self, device):
         self.execute("DELETE FROM attributes WHERE ieee = ?", (device.ieee, ))
+        self.execute("DELETE FROM reporting_config WHERE ieee = ?", (device.ieee, ))
+        self.execute("DELETE FROM node_descriptors WHERE ieee = ?", (device.ieee, ))
         self.execute("DELETE FROM clusters WHERE ieee = ?", (device.ieee, ))
         self.execute("DELETE FROM output_clusters WHERE ieee = ?", (device.ieee, ))
         self.execute("DELETE FROM endpoints WHERE ieee = ?", (device.ieee, ))
@@ -123,6 +155,9 @@ class PersistingListener:
     def _save_device(self, device):
         q = "INSERT OR REPLACE INTO devices (ieee, nwk, status) VALUES (?, ?, ?)"
         self.execute(q, (device.ieee, device.nwk, device.status))
+        if device.node_desc is not None:
+            q = "INSERT OR REPLACE INTO node_descriptors VALUES (?, ?)"
+            self.execute(q, (device.ieee, device.node_desc.serialize()))
         if isinstance(device, zigpy.quirks.CustomDevice):
             self._db.commit()
             return
@@ -156,8 +191,8 @@ class PersistingListener:
     def _save_input_clusters(self, endpoint):
         q = "INSERT OR REPLACE INTO clusters VALUES (?, ?, ?)"
         clusters = [
-            (endpoint.device.ieee, endpoint.endpoint_id, cluster.cluster_id)
-            for cluster in endpoint.in_clusters.values()
+            (endpoint.device.ieee, endpoint.endpoint_id, cluster_id)
+            for cluster_id in endpoint.in_clusters
         ]
         self._cursor.executemany(q, clusters)
         self._db.commit()
@@ -165,8 +200,8 @@ class PersistingListener:
     def _save_output_clusters(self, endpoint):
         q = "INSERT OR REPLACE INTO output_clusters VALUES (?, ?, ?)"
         clusters = [
-            (endpoint.device.ieee, endpoint.endpoint_id, cluster.cluster_id)
-            for cluster in endpoint.out_clusters.values()
+            (endpoint.device.ieee, endpoint.endpoint_id, cluster_id)
+            for cluster_id in endpoint.out_clusters
         ]
         self._cursor.executemany(q, clusters)
         self._db.commit()
@@ -185,6 +220,8 @@ class PersistingListener:
             dev = self._application.add_device(ieee, nwk)
             dev.status = zigpy.device.Status(status)
 
+        self._load_node_descriptors()
+
         for (ieee, epid, profile_id, device_type, status) in self._scan("endpoints"):
             dev = self._application.get_device(ieee)
             ep = dev.add_endpoint(epid)
@@ -202,12 +239,12 @@ class PersistingListener:
         for (ieee, endpoint_id, cluster) in self._scan("clusters"):
             dev = self._application.get_device(ieee)
             ep = dev.endpoints[endpoint_id]
-            ep.add_input_cluster(cluster)
+            ep.add_input_cluster_id(cluster)
 
         for (ieee, endpoint_id, cluster) in self._scan("output_clusters"):
             dev = self._application.get_device(ieee)
             ep = dev.endpoints[endpoint_id]
-            ep.add_output_cluster(cluster)
+            ep.add_output_cluster_id(cluster)
 
         def _load_attributes():
             for (ieee, endpoint_id, cluster, attrid, value) in self._scan("attributes"):
@@ -216,7 +253,7 @@ class PersistingListener:
                     ep = dev.endpoints[endpoint_id]
                     if cluster in ep.in_clusters:
                         clus = ep.in_clusters[cluster]
-                        clus._attr_cache[attrid] = value
+                        clus._cache_attribute(attrid, value, AttributeSource.DB)
                         LOGGER.debug("Attribute id: %s value: %s", attrid, value)
                         if cluster == Basic.cluster_id and attrid == 4:
                             value = value.split(b'\x00')[0]
@@ -226,12 +263,27 @@ class PersistingListener:
                             ep.model = value.decode().strip()
 
         _load_attributes()
+        self._load_reporting_config()
 
         for device in self._application.devices.values():
             device = zigpy.quirks.get_device(device)
             self._application.devices[device.ieee] = device
 
         _load_attributes()
+        self._load_reporting_config()
+
+    def _load_node_descriptors(self):
+        for (ieee, value) in self._scan("node_descriptors"):
+            dev = self._application.get_device(ieee)
+            dev.node_desc = zigpy.zdo.types.NodeDescriptor.deserialize(value)[0]
+
+    def _load_reporting_config(self):
+        for (ieee, endpoint_id, cluster, attrid, *config) in self._scan("reporting_config"):
+            dev = self._application.get_device(ieee)
+            if endpoint_id in dev.endpoints:
+                ep = dev.endpoints[endpoint_id]
+                if cluster in ep.in_clusters:
+                    ep.in_clusters[cluster]._applied_reporting[attrid] = tuple(config)
 
 
 class ClusterPersistingListener:
@@ -242,6 +294,11 @@ class ClusterPersistingListener:
     def attribute_updated(self, attrid, value):
         self._applistener.attribute_updated(self._cluster, attrid, value)
 
+    def reporting_configured(self, attrid, min_interval, max_interval, reportable_change):
+        self._applistener.reporting_configured(
+            self._cluster, attrid, min_interval, max_interval, reportable_change
+        )
+
     def cluster_command(self, *args, **kwargs):
         pass
 
@@ -1,3 +1,6 @@
+import asyncio
+import collections
+import functools
 import logging
 
 import zigpy.appdb
@@ -11,6 +14,139 @@ import zigpy.zdo
 LOGGER = logging.getLogger(__name__)
 
 
+class InterviewScheduler:
+    """Interview devices a few at a time
+
+    Routers and mains powered devices are interviewed before end devices,
+    which need their parents to relay for them. Otherwise devices are
+    interviewed in the order they joined. A failed interview is retried
+    after an exponential backoff, at the back of the queue.
+    """
+    # Number of devices interviewed at once
+    max_concurrent = 4
+    # Number of interviews of a device before it is given up on
+    max_attempts = 3
+    # Delay before the first retry, doubled for every following retry
+    backoff = 5
+    max_backoff = 300
+
+    def __init__(self):
+        self._routers = collections.OrderedDict()
+        self._end_devices = collections.OrderedDict()
+        self._router_nwks = set()
+        self._running = {}
+        self._retries = {}
+        self._attempts = collections.Counter()
+        self.completed = 0
+        self.failed = 0
+
+    @property
+    def queue_depth(self):
+        return len(self._routers) + len(self._end_devices)
+
+    def status(self):
+        """Progress of the interviews"""
+        return {
+            'queued': self.queue_depth,
+            'running': len(self._running),
+            'waiting_retry': len(self._retries),
+            'completed': self.completed,
+            'failed': self.failed,
+        }
+
+    def schedule(self, device):
+        """Queue an interview of a device, restarting one in progress"""
+        self.cancel(device.ieee)
+        device.initializing = True
+        self._enqueue(device)
+        self._start()
+
+    def cancel(self, ieee):
+        """Drop a device from the queue and stop its interview"""
+        self._routers.pop(ieee, None)
+        self._end_devices.pop(ieee, None)
+        self._attempts.pop(ieee, None)
+        task = self._running.pop(ieee, None)
+        if task is not None:
+            LOGGER.debug("Canceling old initialize call")
+            task.cancel()
+        retry = self._retries.pop(ieee, None)
+        if retry is not None:
+            retry.cancel()
+        if task is not None or retry is not None:
+            self._start()
+
+    def _is_router(self, device):
+        node_desc = device.node_desc
+        if node_desc is not None:
+            # Coordinator or router logical type, or mains powered
+            if node_desc.byte1 & 0x07 in (0, 1) or node_desc.mac_capability_flags & 0x04:
+                return True
+        return device.nwk in self._router_nwks
+
+    def add_router(self, nwk):
+        """Interview the device with this NWK address as a router"""
+        self._router_nwks.add(nwk)
+        for ieee, device in list(self._end_devices.items()):
+            if device.nwk == nwk:
+                del self._end_devices[ieee]
+                self._routers[ieee] = device
+
+    def _enqueue(self, device):
+        if self._is_router(device):
+            self._routers[device.ieee] = device
+        else:
+            self._end_devices[device.ieee] = device
+
+    def _start(self):
+        while len(self._running) < self.max_concurrent and self.queue_depth:
+            queue = self._routers or self._end_devices
+            ieee, device = queue.popitem(last=False)
+            self._attempts[ieee] += 1
+            task = asyncio.ensure_future(device._initialize())
+            task.add_done_callback(functools.partial(self._interviewed, device))
+            self._running[ieee] = task
+
+    def _interviewed(self, device, task):
+        exc = None if task.cancelled() else task.exception()
+        if self._running.get(device.ieee) is not task:
+            return  # Rescheduled meanwhile
+        del self._running[device.ieee]
+
+        if task.cancelled():
+            device.initializing = False
+            self._attempts.pop(device.ieee, None)
+        elif device.status == zigpy.device.Status.ENDPOINTS_INIT:
+            self._attempts.pop(device.ieee, None)
+            self.completed += 1
+        else:
+            if exc is not None:
+                LOGGER.warning("Interview of %s failed: %s", device.ieee, exc)
+            self._retry(device)
+        LOGGER.debug("Interviews: %s", self.status())
+        self._start()
+
+    def _retry(self, device):
+        device.initializing = False
+        attempts = self._attempts[device.ieee]
+        if attempts >= self.max_attempts:
+            LOGGER.warning("Giving up on interviewing %s after %d attempts", device.ieee, attempts)
+            self._attempts.pop(device.ieee, None)
+            self.failed += 1
+            return
+
+        delay = min(self.backoff * 2 ** (attempts - 1), self.max_backoff)
+        LOGGER.debug("Retrying interview of %s in %ss", device.ieee, delay)
+
+        def retry():
+            del self._retries[device.ieee]
+            device.initializing = True
+            self._enqueue(device)
+            self._start()
+
+        self._retries[device.ieee] = asyncio.get_event_loop().call_later(delay, retry)
+
+
 class ControllerApplication(zigpy.util.ListenableMixin):
     def __init__(self, database_file=None):
         self._send_sequence = 0
@@ -18,6 +154,9 @@ class ControllerApplication(zigpy.util.ListenableMixin):
         self._listeners = {}
         self._ieee = None
         self._nwk = None
+        # Decode ZCL/ZDO command arguments only when they are first accessed
+        self.lazy_deserialize = False
+        self._interviews = None
 
         if database_file is not None:
             self._dblistener = zigpy.appdb.PersistingListener(database_file, self)
@@ -58,6 +197,7 @@ class ControllerApplication(zigpy.util.ListenableMixin):
             LOGGER.debug("Device not found for removal: %s", ieee)
             return
         LOGGER.info("Removing device 0x%04x (%s)", dev.nwk, ieee)
+        self.interviews.cancel(ieee)
         zdo_worked = False
         try:
             resp = await dev.zdo.leave()
@@ -75,6 +215,8 @@ class ControllerApplication(zigpy.util.ListenableMixin):
         raise NotImplementedError
 
     def deserialize(self, sender, endpoint_id, cluster_id, data):
+        if self.lazy_deserialize:
+            return sender.deserialize(endpoint_id, cluster_id, data, lazy=True)
         return sender.deserialize(endpoint_id, cluster_id, data)
 
     def handle_message(self, sender, is_reply, profile, cluster, src_ep, dst_ep, tsn, command_id, args):
@@ -82,6 +224,9 @@ class ControllerApplication(zigpy.util.ListenableMixin):
 
     def handle_join(self, nwk, ieee, parent_nwk):
         LOGGER.info("Device 0x%04x (%s) joined the network", nwk, ieee)
+        if parent_nwk is not None:
+            # Only routers accept joins, even if their own join went unseen
+            self.interviews.add_router(parent_nwk)
         if ieee in self.devices:
             dev = self.get_device(ieee)
             if dev.nwk != nwk:
@@ -94,7 +239,7 @@ class ControllerApplication(zigpy.util.ListenableMixin):
             dev = self.add_device(ieee, nwk)
 
         self.listener_event('device_joined', dev)
-        dev.schedule_initialize()
+        self.interviews.schedule(dev)
 
     def handle_leave(self, nwk, ieee):
         LOGGER.info("Device 0x%04x (%s) left the network", nwk, ieee)
@@ -159,6 +304,13 @@ class ControllerApplication(zigpy.util.ListenableMixin):
 
         raise KeyError
 
+    @property
+    def interviews(self):
+        """Scheduler of the device interviews"""
+        if getattr(self, '_interviews', None) is None:
+            self._interviews = InterviewScheduler()
+        return self._interviews
+
     @property
     def ieee(self):
         return self._ieee
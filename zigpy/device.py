@@ -11,6 +11,9 @@ from zigpy.types import BroadcastAddress
 
 LOGGER = logging.getLogger(__name__)
 
+# APS payload size assumed for devices without a known node descriptor
+DEFAULT_MAX_PAYLOAD = 82
+
 
 class Status(enum.IntEnum):
     """The status of a Device"""
@@ -24,6 +27,10 @@ class Status(enum.IntEnum):
 
 class Device(zigpy.util.LocalLogMixin):
     """A device on the network"""
+    # Number of requests which can be pipelined to the device at once
+    request_window_size = 2
+    # Number of endpoints which are initialized at once
+    endpoint_init_concurrency = 3
 
     def __init__(self, application, ieee, nwk):
         self._application = application
@@ -36,16 +43,17 @@ class Device(zigpy.util.LocalLogMixin):
         self.last_seen = None
         self.status = Status.NEW
         self.initializing = False
+        self.node_desc = None
+        self._node_desc_requested = False
+        self._request_window = None
 
     def schedule_initialize(self):
-        if self.initializing:
-            LOGGER.debug("Canceling old initialize call")
-            self._init_handle.cancel()
-        else:
-            self.initializing = True
-        self._init_handle = asyncio.ensure_future(self._initialize())
+        self._application.interviews.schedule(self)
 
     async def _initialize(self):
+        if self.node_desc is None and not self._node_desc_requested:
+            await self._initialize_node_desc()
+
         if self.status == Status.NEW:
             self.info("Discovering endpoints")
             try:
@@ -64,15 +72,48 @@ class Device(zigpy.util.LocalLogMixin):
 
             self.status = Status.ZDO_INIT
 
-        for endpoint_id in self.endpoints.keys():
-            if endpoint_id == 0:  # ZDO
-                continue
-            await self.endpoints[endpoint_id].initialize()
+        await self._initialize_endpoints()
 
         self.status = Status.ENDPOINTS_INIT
         self.initializing = False
         self._application.device_initialized(self)
 
+    async def _initialize_node_desc(self):
+        """Request the node descriptor once, interviews go on without it
+
+        A single attempt keeps sleepy end devices from holding up the
+        endpoint discovery, and failed interviews don't ask again.
+        """
+        self._node_desc_requested = True
+        try:
+            ndr = await self.zdo.request(0x0002, self.nwk, tries=1, delay=0)
+        except Exception as exc:
+            self.warn("Failed to request the node descriptor: %s", exc)
+            return
+        if ndr[0] != 0 or not isinstance(ndr[2], zdo.types.NodeDescriptor):
+            self.warn("Node descriptor request failed: %s", ndr)
+            return
+        self.info("Node descriptor: %s", ndr[2])
+        self.node_desc = ndr[2]
+
+    async def _initialize_endpoints(self):
+        """Initialize the endpoints concurrently, a few at a time"""
+        window = asyncio.Semaphore(self.endpoint_init_concurrency)
+
+        async def initialize(endpoint):
+            async with window:
+                await endpoint.initialize()
+
+        results = await asyncio.gather(*[
+            initialize(endpoint)
+            for endpoint_id, endpoint in self.endpoints.items()
+            if endpoint_id != 0  # ZDO
+        ], return_exceptions=True)
+        for result in results:
+            # CancelledError is no Exception subclass since Python 3.8
+            if isinstance(result, BaseException):
+                raise result
+
     def add_endpoint(self, endpoint_id):
         ep = zigpy.endpoint.Endpoint(self, endpoint_id)
         self.endpoints[endpoint_id] = ep
@@ -94,7 +135,9 @@ class Device(zigpy.util.LocalLogMixin):
         self.last_seen = time.time()
         return result
 
-    def deserialize(self, endpoint_id, cluster_id, data):
+    def deserialize(self, endpoint_id, cluster_id, data, lazy=False):
+        if lazy:
+            return self.endpoints[endpoint_id].deserialize(cluster_id, data, lazy=True)
         return self.endpoints[endpoint_id].deserialize(cluster_id, data)
 
     def handle_message(self, is_reply, profile, cluster, src_ep, dst_ep, tsn, command_id, args):
@@ -122,6 +165,20 @@ class Device(zigpy.util.LocalLogMixin):
         args = (self.nwk, ) + args
         return LOGGER.log(lvl, msg, *args)
 
+    @property
+    def max_payload(self):
+        """The largest APS payload the device accepts"""
+        if self.node_desc is not None and self.node_desc.maximum_incoming_transfer_size:
+            return self.node_desc.maximum_incoming_transfer_size
+        return DEFAULT_MAX_PAYLOAD
+
+    @property
+    def request_window(self):
+        """Semaphore limiting the number of pipelined requests"""
+        if self._request_window is None:
+            self._request_window = asyncio.Semaphore(self.request_window_size)
+        return self._request_window
+
     @property
     def application(self):
         return self._application
@@ -1,4 +1,6 @@
+import collections.abc
 import enum
+import inspect
 import logging
 
 import zigpy.appdb
@@ -9,6 +11,23 @@ from zigpy.zcl.clusters.general import Basic
 
 LOGGER = logging.getLogger(__name__)
 
+_LAZY_DESERIALIZE = {}
+
+
+def _deserializes_lazily(cls):
+    """True if the deserialize() of a cluster type takes the lazy keyword
+
+    Quirks may override it with the signature from before lazy decoding.
+    """
+    try:
+        return _LAZY_DESERIALIZE[cls]
+    except KeyError:
+        pass
+    params = inspect.signature(cls.deserialize).parameters.values()
+    lazy = any(p.name == 'lazy' or p.kind == p.VAR_KEYWORD for p in params)
+    _LAZY_DESERIALIZE[cls] = lazy
+    return lazy
+
 
 class Status(enum.IntEnum):
     """The status of an Endpoint"""
@@ -18,13 +37,54 @@ class Status(enum.IntEnum):
     ZDO_INIT = 1
 
 
+class LazyClusterDict(collections.abc.MutableMapping):
+    """Mapping of cluster ids to clusters, created on first access"""
+    def __init__(self, factory):
+        self._factory = factory
+        self._clusters = {}
+
+    def add_lazy(self, cluster_id):
+        self._clusters.setdefault(cluster_id, None)
+
+    def is_created(self, cluster_id):
+        return self._clusters.get(cluster_id) is not None
+
+    def __getitem__(self, cluster_id):
+        cluster = self._clusters[cluster_id]
+        if cluster is None:
+            cluster = self._factory(cluster_id)
+            self._clusters[cluster_id] = cluster
+        return cluster
+
+    def __setitem__(self, cluster_id, cluster):
+        self._clusters[cluster_id] = cluster
+
+    def __delitem__(self, cluster_id):
+        del self._clusters[cluster_id]
+
+    def __contains__(self, cluster_id):
+        return cluster_id in self._clusters
+
+    def __iter__(self):
+        return iter(self._clusters)
+
+    def __len__(self):
+        return len(self._clusters)
+
+    def __repr__(self):
+        return '<%s %s>' % (
+            self.__class__.__name__,
+            ['0x%04x' % (cluster_id, ) for cluster_id in self._clusters],
+        )
+
+
 class Endpoint(zigpy.util.LocalLogMixin, zigpy.util.ListenableMixin):
     """An endpoint on a device on the network"""
     def __init__(self, device, endpoint_id):
         self._device = device
         self._endpoint_id = endpoint_id
-        self.in_clusters = {}
-        self.out_clusters = {}
+        self.in_clusters = LazyClusterDict(self._create_input_cluster)
+        self.out_clusters = LazyClusterDict(self._create_output_cluster)
         self._cluster_attr = {}
         self.status = Status.NEW
         self._listeners = {}
@@ -63,9 +123,9 @@ class Endpoint(zigpy.util.LocalLogMixin, zigpy.util.ListenableMixin):
             pass
 
         for cluster in sd.input_clusters:
-            self.add_input_cluster(cluster)
+            self.add_input_cluster_id(cluster)
         for cluster in sd.output_clusters:
-            self.add_output_cluster(cluster)
+            self.add_output_cluster_id(cluster)
 
         if Basic.cluster_id in self.in_clusters:
             await self.initialize_endpoint_info()
@@ -81,11 +141,29 @@ class Endpoint(zigpy.util.LocalLogMixin, zigpy.util.ListenableMixin):
             return self.in_clusters[cluster_id]
 
         if cluster is None:
-            cluster = zigpy.zcl.Cluster.from_id(self, cluster_id)
+            cluster = self._create_input_cluster(cluster_id)
+        else:
+            self._add_input_cluster_listener(cluster)
         self.in_clusters[cluster_id] = cluster
         if hasattr(cluster, 'ep_attribute'):
-            self._cluster_attr[cluster.ep_attribute] = cluster
+            self._cluster_attr[cluster.ep_attribute] = cluster_id
+        return cluster
 
+    def add_input_cluster_id(self, cluster_id):
+        """Adds an input cluster which is created when first accessed"""
+        if cluster_id in self.in_clusters:
+            return
+        self.in_clusters.add_lazy(cluster_id)
+        cluster_class = zigpy.zcl.Cluster._class_from_id(cluster_id)
+        if hasattr(cluster_class, 'ep_attribute'):
+            self._cluster_attr[cluster_class.ep_attribute] = cluster_id
+
+    def _create_input_cluster(self, cluster_id):
+        cluster = zigpy.zcl.Cluster.from_id(self, cluster_id)
+        self._add_input_cluster_listener(cluster)
+        return cluster
+
+    def _add_input_cluster_listener(self, cluster):
         if hasattr(self._device.application, '_dblistener'):
             listener = zigpy.appdb.ClusterPersistingListener(
                 self._device.application._dblistener,
@@ -93,8 +171,6 @@ class Endpoint(zigpy.util.LocalLogMixin, zigpy.util.ListenableMixin):
             )
             cluster.add_listener(listener)
 
-        return cluster
-
     def add_output_cluster(self, cluster_id, cluster=None):
         """Adds an endpoint's output cluster
 
@@ -104,10 +180,17 @@ class Endpoint(zigpy.util.LocalLogMixin, zigpy.util.ListenableMixin):
             return self.out_clusters[cluster_id]
 
         if cluster is None:
-            cluster = zigpy.zcl.Cluster.from_id(self, cluster_id)
+            cluster = self._create_output_cluster(cluster_id)
         self.out_clusters[cluster_id] = cluster
         return cluster
 
+    def add_output_cluster_id(self, cluster_id):
+        """Adds an output cluster which is created when first accessed"""
+        self.out_clusters.add_lazy(cluster_id)
+
+    def _create_output_cluster(self, cluster_id):
+        return zigpy.zcl.Cluster.from_id(self, cluster_id)
+
     async def initialize_endpoint_info(self):
         attributes = {
             'manufacturer': None,
@@ -144,23 +227,34 @@ class Endpoint(zigpy.util.LocalLogMixin, zigpy.util.ListenableMixin):
         self.debug("Manufacturer: %s", self.manufacturer)
         self.debug("Model: %s", self.model)
 
-    def deserialize(self, cluster_id, data):
-        """Deserialize data for ZCL"""
-        frame_control, data = data[0], data[1:]
+    def deserialize(self, cluster_id, data, lazy=False):
+        """Deserialize data for ZCL
+
+        With ``lazy`` only the ZCL header is decoded, and the command
+        arguments are returned as a LazyValues decoded on first access.
+        """
+        frame_control = data[0]
         frame_type = frame_control & 0b0011
         direction = (frame_control & 0b1000) >> 3
         is_reply = bool(direction)
+        offset = 1
         if frame_control & 0b0100:
             # Manufacturer specific value present
-            data = data[2:]
-        tsn, command_id, data = data[0], data[1], data[2:]
-
-        if cluster_id not in self.in_clusters and cluster_id not in self.out_clusters:
+            offset += 2
+        tsn, command_id = data[offset], data[offset + 1]
+        data = data[offset + 2:]
+
+        if cluster_id in self.in_clusters:
+            cluster = self.in_clusters[cluster_id]
+        elif cluster_id in self.out_clusters:
+            cluster = self.out_clusters[cluster_id]
+        else:
             LOGGER.debug("Ignoring unknown cluster ID 0x%04x",
                          cluster_id)
             return tsn, command_id + 256, is_reply, data
 
-        cluster = self.in_clusters.get(cluster_id, self.out_clusters.get(cluster_id, None))
+        if lazy and _deserializes_lazily(type(cluster)):
+            return cluster.deserialize(tsn, frame_type, is_reply, command_id, data, lazy=True)
         return cluster.deserialize(tsn, frame_type, is_reply, command_id, data)
 
     def handle_message(self, is_reply, profile, cluster, tsn, command_id, args):
@@ -219,6 +313,6 @@ class Endpoint(zigpy.util.LocalLogMixin, zigpy.util.ListenableMixin):
 
     def __getattr__(self, name):
         try:
-            return self._cluster_attr[name]
+            return self.in_clusters[self._cluster_attr[name]]
         except KeyError:
             raise AttributeError
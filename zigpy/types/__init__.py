@@ -1,15 +1,163 @@
+import logging
+
 from .basic import *  # noqa: F401,F403
 from .named import *  # noqa: F401,F403
 from .struct import *  # noqa: F401,F403
+from .basic import _deserializer, _serializer
+from .struct import _compile
+
+LOGGER = logging.getLogger(__name__)
+
+_SCHEMA_CODECS = {}
+
+
+def _compile_decoder(schema):
+    deserializers = tuple(_deserializer(type_) for type_ in schema)
+
+    if not deserializers:
+        def decode(data, offset):
+            return [], offset
+        return decode
+
+    if len(deserializers) == 1:
+        deserialize_value = deserializers[0]
+
+        def decode(data, offset):
+            value, offset = deserialize_value(data, offset)
+            return [value], offset
+        return decode
+
+    def decode_generic(data, offset):
+        result = []
+        for deserialize_value in deserializers:
+            value, offset = deserialize_value(data, offset)
+            result.append(value)
+        return result, offset
+
+    codec = _compile(schema)
+    if codec is None:
+        return decode_generic
+
+    unpack_from, size = codec.unpack_from, codec.size
+
+    def decode(data, offset):
+        if len(data) - offset < size:
+            return decode_generic(data, offset)
+        values = unpack_from(data, offset)
+        return [t(v) for t, v in zip(schema, values)], offset + size
+    return decode
+
+
+def _compile_encoder(schema):
+    serializers = tuple(_serializer(type_) for type_ in schema)
+
+    def encode_generic(data, buf):
+        for t, serialize_into, v in zip(schema, serializers, data):
+            serialize_into(v if type(v) is t else t(v), buf)
+
+    codec = _compile(schema)
+    if codec is None:
+        return encode_generic
+
+    pack, count = codec.pack, len(schema)
+
+    def encode(data, buf):
+        if len(data) != count:
+            # Encode as many values as there are, like zip() does
+            return encode_generic(data, buf)
+        buf += pack(*[v if type(v) is t else t(v) for t, v in zip(schema, data)])
+    return encode
+
+
+def schema_codec(schema):
+    """Return the memoized (decoder, encoder) pair for a schema
+
+    The decoder is called as ``decoder(data, offset)`` and returns
+    ``(values, new_offset)``, the encoder is called as
+    ``encoder(values, buf)`` and appends the serialized values to the
+    ``buf`` bytearray.
+    """
+    try:
+        return _SCHEMA_CODECS[schema]
+    except KeyError:
+        pass
+    except TypeError:
+        # Unhashable (list) schema
+        schema = tuple(schema)
+        if schema in _SCHEMA_CODECS:
+            return _SCHEMA_CODECS[schema]
+
+    schema = tuple(schema)
+    codec = (_compile_decoder(schema), _compile_encoder(schema))
+    _SCHEMA_CODECS[schema] = codec
+    return codec
 
 
 def deserialize(data, schema):
-    result = []
-    for type_ in schema:
-        value, data = type_.deserialize(data)
-        result.append(value)
-    return result, data
+    result, offset = deserialize_from(data, schema)
+    return result, data[offset:]
+
+
+def deserialize_from(data, schema, offset=0):
+    return schema_codec(schema)[0](data, offset)
+
+
+class LazyValues:
+    """Values of a schema, decoded from the frame on first access
+
+    Behaves like the list returned by ``deserialize``, but only pays the
+    decoding cost if somebody actually looks at the values.
+    """
+    __slots__ = ('_data', '_schema', '_offset', '_values')
+
+    def __init__(self, data, schema, offset=0):
+        self._data = data
+        self._schema = schema
+        self._offset = offset
+        self._values = None
+
+    @property
+    def decoded(self):
+        return self._values is not None
+
+    @property
+    def values(self):
+        if self._values is None:
+            values, offset = deserialize_from(self._data, self._schema, self._offset)
+            if offset < len(self._data):
+                LOGGER.warning("Data remains after lazily deserializing frame")
+            self._values = values
+            self._data = None
+        return self._values
+
+    def __getitem__(self, key):
+        return self.values[key]
+
+    def __iter__(self):
+        return iter(self.values)
+
+    def __len__(self):
+        return len(self._schema)
+
+    def __eq__(self, other):
+        if isinstance(other, LazyValues):
+            other = other.values
+        return self.values == other
+
+    def __ne__(self, other):
+        return not self == other
+
+    __hash__ = None
+
+    def __repr__(self):
+        return repr(self.values)
 
 
 def serialize(data, schema):
-    return b''.join(t(v).serialize() for t, v in zip(schema, data))
+    buf = bytearray()
+    schema_codec(schema)[1](data, buf)
+    return bytes(buf)
+
+
+def serialize_into(data, schema, buf):
+    schema_codec(schema)[1](data, buf)
@@ -1,4 +1,61 @@
+import array
+import enum
 import struct
+import sys
+
+_DESERIALIZERS = {}
+_SERIALIZERS = {}
+
+
+def _overrides_legacy(cls, method, legacy_method):
+    """True if a type implements the legacy serialize()/deserialize()
+    protocol method, without the matching offset based one beside or
+    below it"""
+    for klass in cls.__mro__:
+        if method in vars(klass):
+            return False
+        if legacy_method in vars(klass):
+            return True
+    return True
+
+
+def _deserializer(cls):
+    """Return a ``deserialize_from(data, offset)`` callable for a type
+
+    Types implementing only ``deserialize(data)`` are wrapped.
+    """
+    try:
+        return _DESERIALIZERS[cls]
+    except KeyError:
+        pass
+
+    if not _overrides_legacy(cls, 'deserialize_from', 'deserialize'):
+        deserialize_from = cls.deserialize_from
+    else:
+        def deserialize_from(data, offset):
+            value, rest = cls.deserialize(data[offset:])
+            return value, len(data) - len(rest)
+    _DESERIALIZERS[cls] = deserialize_from
+    return deserialize_from
+
+
+def _serializer(cls):
+    """Return a ``serialize_into(value, buf)`` callable for a type
+
+    Types implementing only ``serialize()`` are wrapped.
+    """
+    try:
+        return _SERIALIZERS[cls]
+    except KeyError:
+        pass
+
+    if not _overrides_legacy(cls, 'serialize_into', 'serialize'):
+        serialize_into = cls.serialize_into
+    else:
+        def serialize_into(value, buf):
+            buf += value.serialize()
+    _SERIALIZERS[cls] = serialize_into
+    return serialize_into
 
 
 class int_t(int):  # noqa: N801
@@ -7,10 +64,19 @@ class int_t(int):  # noqa: N801
     def serialize(self):
         return self.to_bytes(self._size, 'little', signed=self._signed)
 
+    def serialize_into(self, buf):
+        buf += self.to_bytes(self._size, 'little', signed=self._signed)
+
     @classmethod
     def deserialize(cls, data):
-        r = cls.from_bytes(data[:cls._size], 'little', signed=cls._signed)
-        return r, data[cls._size:]
+        r, offset = cls.deserialize_from(data, 0)
+        return r, data[offset:]
+
+    @classmethod
+    def deserialize_from(cls, data, offset):
+        end = offset + cls._size
+        r = cls.from_bytes(data[offset:end], 'little', signed=cls._signed)
+        return r, end
 
 
 class int8s(int_t):  # noqa: N801
@@ -125,18 +191,34 @@ class Single(float):
     def serialize(self):
         return struct.pack('<f', self)
 
+    def serialize_into(self, buf):
+        buf += struct.pack('<f', self)
+
     @classmethod
     def deserialize(cls, data):
-        return struct.unpack('<f', data)[0], data[4:]
+        r, offset = cls.deserialize_from(data, 0)
+        return r, data[offset:]
+
+    @classmethod
+    def deserialize_from(cls, data, offset):
+        return struct.unpack_from('<f', data, offset)[0], offset + 4
 
 
 class Double(float):
     def serialize(self):
         return struct.pack('<d', self)
 
+    def serialize_into(self, buf):
+        buf += struct.pack('<d', self)
+
     @classmethod
     def deserialize(cls, data):
-        return struct.unpack('<d', data)[0], data[8:]
+        r, offset = cls.deserialize_from(data, 0)
+        return r, data[offset:]
+
+    @classmethod
+    def deserialize_from(cls, data, offset):
+        return struct.unpack_from('<d', data, offset)[0], offset + 8
 
 
 class LVBytes(bytes):
@@ -145,46 +227,155 @@ class LVBytes(bytes):
             len(self),
         ]) + self
 
+    def serialize_into(self, buf):
+        buf.append(len(self))
+        buf += self
+
+    @classmethod
+    def deserialize(cls, data):
+        r, offset = cls.deserialize_from(data, 0)
+        return r, data[offset:]
+
+    @classmethod
+    def deserialize_from(cls, data, offset):
+        length = int.from_bytes(data[offset:offset + 1], 'little')
+        offset += 1
+        end = offset + length
+        return bytes(data[offset:end]), end
+
+
+class LongOctetString:
+    """Octet string with a 16-bit length prefix
+
+    A decoded value is a view of the frame it was decoded from and is only
+    copied to bytes when needed, so large values are not duplicated.
+    """
+    __slots__ = ('_view', )
+
+    def __init__(self, value=b''):
+        if isinstance(value, LongOctetString):
+            value = value._view
+        self._view = memoryview(value).cast('B')
+
+    def __bytes__(self):
+        return self._view.tobytes()
+
+    def tobytes(self):
+        return self._view.tobytes()
+
+    def __len__(self):
+        return len(self._view)
+
+    def __getitem__(self, item):
+        if isinstance(item, slice):
+            return self.__class__(self._view[item])
+        return self._view[item]
+
+    def __iter__(self):
+        return iter(self._view)
+
+    def __eq__(self, other):
+        if isinstance(other, LongOctetString):
+            other = other._view
+        try:
+            return self._view == other
+        except TypeError:
+            return NotImplemented
+
+    def __hash__(self):
+        return hash(self.tobytes())
+
+    def __repr__(self):
+        return '%s(%r)' % (self.__class__.__name__, self.tobytes())
+
+    def __conform__(self, protocol):
+        # Stored as a blob by sqlite3
+        return self.tobytes()
+
+    def serialize(self):
+        buf = bytearray()
+        self.serialize_into(buf)
+        return bytes(buf)
+
+    def serialize_into(self, buf):
+        buf += len(self._view).to_bytes(2, 'little')
+        buf += self._view
+
     @classmethod
     def deserialize(cls, data):
-        bytes = int.from_bytes(data[:1], 'little')
-        s = data[1:bytes + 1]
-        return s, data[bytes + 1:]
+        r, offset = cls.deserialize_from(data, 0)
+        return r, data[offset:]
+
+    @classmethod
+    def deserialize_from(cls, data, offset):
+        length = int.from_bytes(data[offset:offset + 2], 'little')
+        offset += 2
+        end = offset + length
+        if end > len(data):
+            raise ValueError("Data is too short for a %d byte string" % (length, ))
+        if isinstance(data, bytearray):
+            # A mutable buffer may be reused, don't keep a view of it
+            return cls(bytes(data[offset:end])), end
+        return cls(memoryview(data)[offset:end]), end
+
+
+class LongCharacterString(LongOctetString):
+    __slots__ = ()
+
+    def decode(self, encoding='utf-8', errors='strict'):
+        return str(self._view, encoding, errors)
+
+    def __str__(self):
+        return self.decode(errors='replace')
 
 
 class _List(list):
     _length = None
 
     def serialize(self):
+        buf = bytearray()
+        self.serialize_into(buf)
+        return bytes(buf)
+
+    def serialize_into(self, buf):
         assert self._length is None or len(self) == self._length
-        return b''.join([i.serialize() for i in self])
+        for i in self:
+            _serializer(type(i))(i, buf)
 
     @classmethod
     def deserialize(cls, data):
+        r, offset = cls.deserialize_from(data, 0)
+        return r, data[offset:]
+
+    @classmethod
+    def deserialize_from(cls, data, offset):
         r = cls()
-        while data:
-            item, data = r._itemtype.deserialize(data)
+        deserialize_item = _deserializer(cls._itemtype)
+        end = len(data)
+        while offset < end:
+            item, offset = deserialize_item(data, offset)
             r.append(item)
-        return r, data
+        return r, offset
 
 
 class _LVList(_List):
     _prefix_length = 1
 
-    def serialize(self):
-        head = len(self).to_bytes(self._prefix_length, 'little')
-        data = super().serialize()
-        return head + data
+    def serialize_into(self, buf):
+        buf += len(self).to_bytes(self._prefix_length, 'little')
+        super().serialize_into(buf)
 
     @classmethod
-    def deserialize(cls, data):
+    def deserialize_from(cls, data, offset):
         r = cls()
-        length = int.from_bytes(data[:cls._prefix_length], 'little')
-        data = data[cls._prefix_length:]
+        end = offset + cls._prefix_length
+        length = int.from_bytes(data[offset:end], 'little')
+        offset = end
+        deserialize_item = _deserializer(cls._itemtype)
         for i in range(length):
-            item, data = r._itemtype.deserialize(data)
+            item, offset = deserialize_item(data, offset)
             r.append(item)
-        return r, data
+        return r, offset
 
 
 def List(itemtype):  # noqa: N802
@@ -202,12 +393,13 @@ def LVList(itemtype, prefix_length=1):  # noqa: N802
 
 class _FixedList(_List):
     @classmethod
-    def deserialize(cls, data):
+    def deserialize_from(cls, data, offset):
         r = cls()
-        for i in range(r._length):
-            item, data = r._itemtype.deserialize(data)
+        deserialize_item = _deserializer(cls._itemtype)
+        for i in range(cls._length):
+            item, offset = deserialize_item(data, offset)
             r.append(item)
-        return r, data
+        return r, offset
 
 
 def fixed_list(length, itemtype):
@@ -216,3 +408,126 @@ def fixed_list(length, itemtype):
         _itemtype = itemtype
 
     return FixedList
+
+
+def _array_typecode(itemtype):
+    """Return the array typecode matching a fixed-width integer type"""
+    if not (isinstance(itemtype, type) and issubclass(itemtype, int_t)):
+        return None
+    if (_overrides_legacy(itemtype, 'deserialize_from', 'deserialize') or
+            _overrides_legacy(itemtype, 'serialize_into', 'serialize')):
+        return None
+    if issubclass(itemtype, enum.Enum):
+        return None
+    for typecode in ('bhilq' if itemtype._signed else 'BHILQ'):
+        if array.array(typecode).itemsize == getattr(itemtype, '_size', None):
+            return typecode
+    return None
+
+
+class _NumericList(array.array):
+    """A list of fixed-width integers backed by an array.array
+
+    The whole run of items is decoded and encoded with a single call instead
+    of one Python object per item.
+    """
+    _typecode = None
+    _itemtype = None
+
+    def __new__(cls, initializer=()):
+        return super().__new__(cls, cls._typecode, initializer)
+
+    def _serialize_items(self):
+        if sys.byteorder == 'little':
+            return self.tobytes()
+        swapped = array.array(self.typecode, self)
+        swapped.byteswap()
+        return swapped.tobytes()
+
+    def serialize(self):
+        return self._serialize_items()
+
+    def serialize_into(self, buf):
+        buf += self._serialize_items()
+
+    @classmethod
+    def _deserialize_items(cls, data, offset, count):
+        r = cls()
+        end = offset + count * r.itemsize
+        chunk = data[offset:end]
+        chunk = chunk[:len(chunk) - len(chunk) % r.itemsize]
+        r.frombytes(chunk)
+        if sys.byteorder != 'little':
+            r.byteswap()
+        return r, end
+
+    @classmethod
+    def deserialize(cls, data):
+        r, offset = cls.deserialize_from(data, 0)
+        return r, data[offset:]
+
+    @classmethod
+    def deserialize_from(cls, data, offset):
+        count = (len(data) - offset) // array.array(cls._typecode).itemsize
+        return cls._deserialize_items(data, offset, count)
+
+    def __eq__(self, other):
+        if isinstance(other, list):
+            return self.tolist() == other
+        return super().__eq__(other)
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __repr__(self):
+        return repr(self.tolist())
+
+    def __copy__(self):
+        # array.array copies would drop the subclass
+        return type(self)(self)
+
+    def __deepcopy__(self, memo):
+        return type(self)(self)
+
+
+class _LVNumericList(_NumericList):
+    _prefix_length = 1
+
+    def serialize(self):
+        head = len(self).to_bytes(self._prefix_length, 'little')
+        return head + self._serialize_items()
+
+    def serialize_into(self, buf):
+        buf += len(self).to_bytes(self._prefix_length, 'little')
+        buf += self._serialize_items()
+
+    @classmethod
+    def deserialize_from(cls, data, offset):
+        end = offset + cls._prefix_length
+        length = int.from_bytes(data[offset:end], 'little')
+        return cls._deserialize_items(data, end, length)
+
+
+def NumericList(itemtype):  # noqa: N802
+    """List of fixed-width integers, falls back to List for other types"""
+    typecode = _array_typecode(itemtype)
+    if typecode is None:
+        return List(itemtype)
+
+    class NumericList(_NumericList):
+        _itemtype = itemtype
+        _typecode = typecode
+    return NumericList
+
+
+def LVNumericList(itemtype, prefix_length=1):  # noqa: N802
+    """Length prefixed NumericList, falls back to LVList for other types"""
+    typecode = _array_typecode(itemtype)
+    if typecode is None:
+        return LVList(itemtype, prefix_length)
+
+    class LVNumericList(_LVNumericList):
+        _itemtype = itemtype
+        _typecode = typecode
+        _prefix_length = prefix_length
+    return LVNumericList
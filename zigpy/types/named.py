@@ -14,22 +14,65 @@ class BroadcastAddress(basic.uint16_t, enum.Enum):
     RESERVED_FFF8 = 0xfff8
 
 
-class EUI64(basic.fixed_list(8, basic.uint8_t)):
-    # EUI 64-bit ID (an IEEE address).
-    @classmethod
-    def deserialize(cls, data):
-        r, data = super().deserialize(data)
-        return cls(r[::-1]), data
+class EUI64(basic.uint64_t):
+    """EUI 64-bit ID (an IEEE address)
+
+    Backed by a single immutable integer, so hashing and equality are cheap.
+    Indexing and iteration yield the address octets in display order. Like
+    any integer it equals the same plain int and the all zero address is
+    falsy.
+    """
+    _length = 8
+
+    def __new__(cls, value=0):
+        if not isinstance(value, int):
+            value = bytes(value)
+            if len(value) != cls._length:
+                raise ValueError("EUI64 must be 8 octets long: %r" % (value, ))
+            value = int.from_bytes(value, 'big')
+        return super().__new__(cls, value)
+
+    def __getitem__(self, key):
+        octets = self.to_bytes(self._length, 'big')
+        if isinstance(key, slice):
+            return [basic.uint8_t(i) for i in octets[key]]
+        return basic.uint8_t(octets[key])
+
+    def __iter__(self):
+        return iter([basic.uint8_t(i) for i in self.to_bytes(self._length, 'big')])
+
+    def __len__(self):
+        return self._length
 
-    def serialize(self):
-        assert self._length == len(self)
-        return b''.join([i.serialize() for i in self[::-1]])
+    def __eq__(self, other):
+        if isinstance(other, list):
+            # Addresses used to be lists of octets
+            return list(self) == other
+        return int.__eq__(self, other)
+
+    def __ne__(self, other):
+        if isinstance(other, list):
+            return list(self) != other
+        return int.__ne__(self, other)
+
+    __hash__ = int.__hash__
 
     def __repr__(self):
-        return ':'.join('%02x' % i for i in self)
+        return ':'.join('%02x' % i for i in self.to_bytes(self._length, 'big'))
+
+    __str__ = __repr__
 
-    def __hash__(self):
-        return hash(repr(self))
+    def __format__(self, format_spec):
+        if not format_spec:
+            return repr(self)
+        return super().__format__(format_spec)
+
+    @classmethod
+    def convert(cls, ieee):
+        """Parse a colon separated string (or bytes) representation"""
+        if isinstance(ieee, str):
+            ieee = ieee.encode('ascii')
+        return cls(int(ieee.replace(b':', b''), 16))
 
 
 class KeyData(basic.fixed_list(16, basic.uint8_t)):
@@ -1,4 +1,68 @@
-class Struct:
+import struct
+
+from . import basic
+
+
+_INT_FORMATS = {1: 'b', 2: 'h', 4: 'i', 8: 'q'}
+
+
+def _field_format(field_type):
+    """Return the struct format character for a fixed-width field type"""
+    if not isinstance(field_type, type):
+        return None
+    if (basic._overrides_legacy(field_type, 'deserialize_from', 'deserialize') or
+            basic._overrides_legacy(field_type, 'serialize_into', 'serialize')):
+        return None
+    if issubclass(field_type, basic.int_t):
+        code = _INT_FORMATS.get(getattr(field_type, '_size', None))
+        if code is None:
+            return None
+        return code if field_type._signed else code.upper()
+    if issubclass(field_type, basic.Single):
+        return 'f'
+    if issubclass(field_type, basic.Double):
+        return 'd'
+    return None
+
+
+def _compile(field_types):
+    """Build a struct.Struct for a sequence of fixed-width types
+
+    Returns None if any of the types has a variable length, in which case
+    the generic per-field codec is used.
+    """
+    if not field_types:
+        return None
+    fmt = '<'
+    for field_type in field_types:
+        code = _field_format(field_type)
+        if code is None:
+            return None
+        fmt += code
+    return struct.Struct(fmt)
+
+
+class StructMeta(type):
+    def __new__(mcs, name, bases, nmspc):  # noqa: N804
+        if '__slots__' not in nmspc:
+            # Generate slots for the fields not already slotted by a base
+            inherited = set()
+            for base in bases:
+                for klass in base.__mro__:
+                    inherited.update(getattr(klass, '__slots__', ()))
+            nmspc['__slots__'] = tuple(
+                field[0] for field in nmspc.get('_fields', ())
+                if field[0] not in inherited
+            )
+        return super(StructMeta, mcs).__new__(mcs, name, bases, nmspc)
+
+    def __init__(cls, name, bases, nmspc):  # noqa: N805
+        super(StructMeta, cls).__init__(name, bases, nmspc)
+        fields = getattr(cls, '_fields', None) or ()
+        cls._struct_codec = _compile([f[1] for f in fields])
+
+
+class Struct(metaclass=StructMeta):
     def __init__(self, *args, **kwargs):
         if len(args) == 1 and isinstance(args[0], self.__class__):
             # copy constructor
@@ -6,18 +70,39 @@ class Struct:
                 setattr(self, field[0], getattr(args[0], field[0]))
 
     def serialize(self):
-        r = b''
+        buf = bytearray()
+        self.serialize_into(buf)
+        return bytes(buf)
+
+    def serialize_into(self, buf):
+        codec = self._struct_codec
+        if codec is not None:
+            buf += codec.pack(*[getattr(self, f[0]) for f in self._fields])
+            return
+
         for field in self._fields:
-            r += getattr(self, field[0]).serialize()
-        return r
+            value = getattr(self, field[0])
+            basic._serializer(type(value))(value, buf)
 
     @classmethod
     def deserialize(cls, data):
+        r, offset = cls.deserialize_from(data, 0)
+        return r, data[offset:]
+
+    @classmethod
+    def deserialize_from(cls, data, offset):
         r = cls()
+        codec = cls._struct_codec
+        if codec is not None and len(data) - offset >= codec.size:
+            values = codec.unpack_from(data, offset)
+            for (field_name, field_type), v in zip(cls._fields, values):
+                setattr(r, field_name, field_type(v))
+            return r, offset + codec.size
+
         for field_name, field_type in cls._fields:
-            v, data = field_type.deserialize(data)
+            v, offset = basic._deserializer(field_type)(data, offset)
             setattr(r, field_name, v)
-        return r, data
+        return r, offset
 
     def __repr__(self):
         r = '<%s ' % (self.__class__.__name__, )
@@ -26,6 +26,17 @@ class ListenableMixin:
             except Exception as e:
                 LOGGER.warning("Error calling listener.%s: %s", method_name, e)
 
+    def optional_listener_event(self, method_name, *args):
+        """Like listener_event, skipping listeners without the method"""
+        for listener in self._listeners.values():
+            method = getattr(listener, method_name, None)
+            if method is None:
+                continue
+            try:
+                method(*args)
+            except Exception as e:
+                LOGGER.warning("Error calling listener.%s: %s", method_name, e)
+
 
 class LocalLogMixin:
     def debug(self, msg, *args):
@@ -1,6 +1,11 @@
 import asyncio
+import bisect
+import collections
+import enum
 import functools
+import inspect
 import logging
+import time
 
 import zigpy.types as t
 from zigpy import util
@@ -10,6 +15,43 @@ from zigpy.zcl import foundation
 LOGGER = logging.getLogger(__name__)
 
 
+class AttributeSource(enum.Enum):
+    """Where a cached attribute value came from"""
+    REPORT = 'report'
+    READ = 'read'
+    DB = 'db'
+
+
+def _server_command(command_id, schema, direct):
+    if direct:
+        def command(self, *args, manufacturer=None, expect_reply=True):
+            return self.request(False, command_id, schema, *args,
+                                manufacturer=manufacturer, expect_reply=expect_reply)
+    else:
+        # Cluster.command is overridden, so it has to see every call
+        def command(self, *args, **kwargs):
+            return self.command(command_id, *args, **kwargs)
+    return command
+
+
+def _client_command(command_id, schema, direct):
+    if direct:
+        def command(self, *args):
+            return self.reply(False, command_id, schema, *args)
+    else:
+        def command(self, *args, **kwargs):
+            return self.client_command(command_id, *args, **kwargs)
+    return command
+
+
+def _no_command(self):
+    raise AttributeError
+
+
+# Shadows a command method inherited for a command the subclass dropped
+_REMOVED_COMMAND = property(_no_command)
+
+
 class Registry(type):
     def __init__(cls, name, bases, nmspc):  # noqa: N805
         super(Registry, cls).__init__(name, bases, nmspc)
@@ -28,6 +70,8 @@ class Registry(type):
             for command_id, details in cls.client_commands.items():
                 command_name, schema, is_reply = details
                 cls._client_command_idx[command_name] = command_id
+        if hasattr(cls, 'server_commands') or hasattr(cls, 'client_commands'):
+            cls._add_command_methods()
 
         if getattr(cls, '_skip_registry', False):
             return
@@ -36,37 +80,218 @@ class Registry(type):
             cls._registry[cls.cluster_id] = cls
         if hasattr(cls, 'cluster_id_range'):
             cls._registry_range[cls.cluster_id_range] = cls
+            cls._index_registry_range()
+
+    def _index_registry_range(cls):  # noqa: N805
+        index = sorted(
+            (start, end, cluster)
+            for (start, end), cluster in cls._registry_range.items()
+        )
+        reach = []
+        for _, end, _ in index:
+            reach.append(max(end, reach[-1]) if reach else end)
+        # Mutate in place, these are shared by all clusters
+        cls._registry_range_index[:] = index
+        cls._registry_range_starts[:] = [entry[0] for entry in index]
+        cls._registry_range_reach[:] = reach
+        cls._registry_range_cache.clear()
+
+    def _add_command_methods(cls):  # noqa: N805
+        """Generate a method for each command, with its schema bound"""
+        methods = {}
+        direct = cls.command is Cluster.command
+        for command_id, (command_name, schema, _) in getattr(cls, 'server_commands', {}).items():
+            methods[command_name] = _server_command(command_id, schema, direct)
+        # Client commands take precedence, as they did in __getattr__
+        direct = cls.client_command is Cluster.client_command
+        for command_id, (command_name, schema, _) in getattr(cls, 'client_commands', {}).items():
+            methods[command_name] = _client_command(command_id, schema, direct)
+
+        for command_name in getattr(cls, '_command_methods', ()):
+            existing = getattr(cls, command_name, None)
+            if command_name not in methods and getattr(existing, '_zcl_command', False):
+                setattr(cls, command_name, _REMOVED_COMMAND)
+        for command_name, method in methods.items():
+            existing = getattr(cls, command_name, _REMOVED_COMMAND)
+            if existing is not _REMOVED_COMMAND and not getattr(existing, '_zcl_command', False):
+                continue  # Never shadow a real attribute
+            method.__name__ = command_name
+            method.__qualname__ = '%s.%s' % (cls.__qualname__, command_name)
+            method._zcl_command = True
+            setattr(cls, command_name, method)
+        cls._command_methods = frozenset(methods)
+
+
+# Discover command id: (response record size, largest attribute/command id)
+_DISCOVERY_RECORDS = {
+    0x0c: (3, 0xffff),
+    0x11: (1, 0xff),
+    0x13: (1, 0xff),
+    0x15: (4, 0xffff),
+}
+
+
+def _discovered_id(record):
+    return getattr(record, 'attrid', record)
+
+
+def _reporting_bytes(cfg):
+    """A reporting configuration as it is sent, for comparisons"""
+    buf = bytearray()
+    foundation.AttributeReportingConfig.serialize_into(cfg, buf)
+    return bytes(buf)
+
+
+def _retrieve_exception(future):
+    if not future.cancelled():
+        future.exception()
+
+
+class DiscoveryIterator:
+    """Iterate over all records of a discover command
+
+    Pages are requested as needed, and the next page is already requested
+    while the records of the current one are consumed. The records of a
+    completed discovery are stored on the cluster.
+    """
+
+    def __init__(self, cluster, cmd_id, manufacturer=None):
+        self._cluster = cluster
+        self._cmd_id = cmd_id
+        self._manufacturer = manufacturer
+        self._records = collections.deque()
+        self._found = []
+        self._pending = None
+        self._next_start = 0
+
+        cached = cluster._discovered.get((cmd_id, manufacturer))
+        if cached is not None:
+            self._records.extend(cached)
+            self._next_start = None
+
+    def _page_size(self):
+        record_size, _ = _DISCOVERY_RECORDS[self._cmd_id]
+        # The response starts with the discovery complete flag
+        size = (self._cluster._max_payload(self._manufacturer) - 1) // record_size
+        return max(1, min(size, 0xff))
+
+    def _fetch(self, start):
+        self._next_start = None
+        self._pending = asyncio.ensure_future(self._cluster._discover(
+            self._cmd_id, start, self._page_size(), manufacturer=self._manufacturer
+        ))
+        # A prefetched page may never be awaited if iteration stops early
+        self._pending.add_done_callback(_retrieve_exception)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        while not self._records:
+            if self._pending is None:
+                if self._next_start is None:
+                    raise StopAsyncIteration
+                self._fetch(self._next_start)
+            pending, self._pending = self._pending, None
+            self._handle_page(await pending)
+        return self._records.popleft()
+
+    def _handle_page(self, result):
+        if not isinstance(result[1], list):
+            self._cluster.debug("Discovery 0x%02x failed: %s", self._cmd_id, result)
+            return  # Default response
+
+        complete, records = result
+        self._records.extend(records)
+        self._found.extend(records)
+        _, max_id = _DISCOVERY_RECORDS[self._cmd_id]
+        if records and not complete:
+            start = _discovered_id(records[-1]) + 1
+            if start <= max_id:
+                self._fetch(start)
+                return
+        elif not complete:
+            return  # No progress, don't store an incomplete result
+
+        self._cluster._discovered[(self._cmd_id, self._manufacturer)] = self._found
 
 
 class Cluster(util.ListenableMixin, util.LocalLogMixin, metaclass=Registry):
     """A cluster on an endpoint"""
     _registry = {}
     _registry_range = {}
+    # Sorted (start, end, cluster) entries of _registry_range, their starts,
+    # and the running maximum of their ends
+    _registry_range_index = []
+    _registry_range_starts = []
+    _registry_range_reach = []
+    # Cluster ids already looked up in the ranges, None when unknown
+    _registry_range_cache = {}
     _server_command_idx = {}
     _client_command_idx = {}
+    # Concurrent read_attributes calls are merged into frames of at most
+    # this many attributes. The batch is sent on the next loop iteration,
+    # or after read_batch_delay seconds if that is set.
+    read_batch_max_attributes = 16
+    read_batch_delay = 0
+    # Maximum age in seconds of cached values returned by cluster[attr],
+    # None to return cached values regardless of their age
+    cache_max_age = None
 
     def __init__(self, endpoint):
         self._endpoint = endpoint
         self._attr_cache = {}
+        self._attr_last_updated = {}
+        self._update_source = AttributeSource.READ
+        self.attr_cache_stats = collections.Counter()
         self._listeners = {}
+        self._read_batches = {}
+        self._inflight = {}
+        self._discovered = {}
+        # Attribute id to (min_interval, max_interval, reportable_change)
+        self._applied_reporting = {}
 
     @classmethod
     def from_id(cls, endpoint, cluster_id):
         if cluster_id in cls._registry:
             return cls._registry[cluster_id](endpoint)
-        else:
-            for cluster_id_range, cluster in cls._registry_range.items():
-                if cluster_id_range[0] <= cluster_id <= cluster_id_range[1]:
-                    c = cluster(endpoint)
-                    c.cluster_id = cluster_id
-                    return c
-
-        LOGGER.warning("Unknown cluster %s", cluster_id)
-        c = cls(endpoint)
+
+        c = cls._class_from_id(cluster_id)(endpoint)
         c.cluster_id = cluster_id
         return c
 
-    def deserialize(self, tsn, frame_type, is_reply, command_id, data):
+    @classmethod
+    def _class_from_id(cls, cluster_id):
+        """The class from_id instantiates for a cluster id"""
+        if cluster_id in cls._registry:
+            return cls._registry[cluster_id]
+        cluster = cls._lookup_range(cluster_id)
+        if cluster is None:
+            return cls
+        return cluster
+
+    @classmethod
+    def _lookup_range(cls, cluster_id):
+        try:
+            return cls._registry_range_cache[cluster_id]
+        except KeyError:
+            pass
+
+        found = None
+        index = cls._registry_range_index
+        i = bisect.bisect_right(cls._registry_range_starts, cluster_id) - 1
+        while i >= 0 and cls._registry_range_reach[i] >= cluster_id:
+            if index[i][1] >= cluster_id:
+                found = index[i][2]
+                break
+            i -= 1
+
+        if found is None:
+            LOGGER.warning("Unknown cluster %s", cluster_id)
+        cls._registry_range_cache[cluster_id] = found
+        return found
+
+    def deserialize(self, tsn, frame_type, is_reply, command_id, data, lazy=False):
         if frame_type == 1:
             # Cluster command
             if is_reply:
@@ -92,8 +317,11 @@ class Cluster(util.ListenableMixin, util.LocalLogMixin, metaclass=Registry):
                 LOGGER.warning("Unknown foundation command %s", command_id)
                 return tsn, command_id, is_reply, data
 
-        value, data = t.deserialize(data, schema)
-        if data != b'':
+        if lazy:
+            return tsn, command_id, is_reply, t.LazyValues(data, schema)
+
+        value, offset = t.deserialize_from(data, schema)
+        if offset < len(data):
             LOGGER.warning("Data remains after deserializing ZCL frame")
 
         return tsn, command_id, is_reply, value
@@ -106,20 +334,40 @@ class Cluster(util.ListenableMixin, util.LocalLogMixin, metaclass=Registry):
             error.set_exception(ValueError("Wrong number of parameters for request, expected %d argument(s)" % len(schema)))
             return error
 
+        key = payload = None
+        if general and expect_reply and command_id in foundation.IDEMPOTENT_COMMANDS:
+            payload = t.serialize(args, schema)
+            key = (command_id, manufacturer, payload)
+            inflight = self._inflight.get(key)
+            if inflight is not None:
+                self.debug("Joining in-flight request 0x%02x", command_id)
+                return asyncio.shield(inflight)
+
         sequence = self._endpoint._device.application.get_sequence()
         if general:
             frame_control = 0x00
         else:
             frame_control = 0x01
-        if manufacturer is not None:
-            frame_control |= 0b0100
-            manufacturer = manufacturer.to_bytes(2, 'little')
-        else:
-            manufacturer = b''
-        data = bytes([frame_control]) + manufacturer + bytes([sequence, command_id])
-        data += t.serialize(args, schema)
+        data = self._serialize_frame(
+            frame_control, sequence, command_id, schema, args, manufacturer, payload
+        )
+
+        result = self._endpoint.request(self.cluster_id, sequence, data, expect_reply=expect_reply)
+        if key is None or not inspect.isawaitable(result):
+            return result
+        return self._single_flight(key, result)
+
+    def _single_flight(self, key, request):
+        """Share an in-flight request with identical later requests"""
+        future = asyncio.ensure_future(request)
+        self._inflight[key] = future
 
-        return self._endpoint.request(self.cluster_id, sequence, data, expect_reply=expect_reply)
+        def done(_):
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+
+        future.add_done_callback(done)
+        return asyncio.shield(future)
 
     def reply(self, general, command_id, schema, *args, manufacturer=None):
         if len(schema) != len(args):
@@ -132,16 +380,30 @@ class Cluster(util.ListenableMixin, util.LocalLogMixin, metaclass=Registry):
         frame_control = 0b1000  # Cluster reply command
         if not general:
             frame_control |= 0x01
-        if manufacturer is not None:
-            frame_control |= 0b0100
-            manufacturer = manufacturer.to_bytes(2, 'little')
-        else:
-            manufacturer = b''
-        data = bytes([frame_control]) + manufacturer + bytes([sequence, command_id])
-        data += t.serialize(args, schema)
+        data = self._serialize_frame(
+            frame_control, sequence, command_id, schema, args, manufacturer
+        )
 
         return self._endpoint.reply(self.cluster_id, sequence, data)
 
+    def _serialize_frame(self, frame_control, sequence, command_id, schema,
+                         args, manufacturer=None, payload=None):
+        """Write the ZCL header and payload into a single buffer
+
+        ``payload`` is the already serialized args, if available.
+        """
+        data = bytearray((frame_control, ))
+        if manufacturer is not None:
+            data[0] |= 0b0100
+            data += manufacturer.to_bytes(2, 'little')
+        data.append(sequence)
+        data.append(command_id)
+        if payload is None:
+            t.serialize_into(args, schema, data)
+        else:
+            data += payload
+        return bytes(data)
+
     def handle_message(self, is_reply, tsn, command_id, args):
         if is_reply:
             self.debug("Unexpected ZCL reply 0x%04x: %s", command_id, args)
@@ -158,12 +420,19 @@ class Cluster(util.ListenableMixin, util.LocalLogMixin, metaclass=Registry):
             return
 
         if command_id == 0x0a:  # Report attributes
-            valuestr = ", ".join([
-                "%s=%s" % (a.attrid, a.value.value) for a in args[0]
-            ])
-            self.debug("Attribute report received: %s", valuestr)
-            for attr in args[0]:
-                self._update_attribute(attr.attrid, attr.value.value)
+            records = args[0]
+            if not isinstance(records, foundation.AttributeReportList):
+                records = foundation.AttributeReportList(
+                    (a.attrid, getattr(a.value, 'type', None), a.value.value)
+                    for a in records
+                )
+            self.debug("Attribute report received: %s", records)
+            self._update_source = AttributeSource.REPORT
+            try:
+                for attrid, _, value in records:
+                    self._update_attribute(attrid, value)
+            finally:
+                self._update_source = AttributeSource.READ
         else:
             self.handle_cluster_general_request(tsn, command_id, args)
 
@@ -175,11 +444,12 @@ class Cluster(util.ListenableMixin, util.LocalLogMixin, metaclass=Registry):
 
     async def read_attributes_raw(self, attributes, manufacturer=None):
         schema = foundation.COMMANDS[0x00][1]
-        attributes = [t.uint16_t(a) for a in attributes]
+        attributes = schema[0](attributes)
         v = await self.request(True, 0x00, schema, attributes, manufacturer=manufacturer)
         return v
 
-    async def read_attributes(self, attributes, allow_cache=False, only_cache=False, raw=False, manufacturer=None):
+    async def read_attributes(self, attributes, allow_cache=False, only_cache=False, raw=False, manufacturer=None,
+                              max_age=None):
         if raw:
             assert len(attributes) == 1
         success, failure = {}, {}
@@ -194,12 +464,18 @@ class Cluster(util.ListenableMixin, util.LocalLogMixin, metaclass=Registry):
             orig_attributes[attrid] = attribute
 
         to_read = []
-        if allow_cache or only_cache:
+        if allow_cache or only_cache or max_age is not None:
+            now = time.time()
             for idx, attribute in enumerate(attribute_ids):
-                if attribute in self._attr_cache:
-                    success[attributes[idx]] = self._attr_cache[attribute]
-                else:
+                if attribute not in self._attr_cache:
+                    self.attr_cache_stats['miss'] += 1
+                    to_read.append(attribute)
+                elif max_age is not None and not self._is_fresh(attribute, max_age, now):
+                    self.attr_cache_stats['stale'] += 1
                     to_read.append(attribute)
+                else:
+                    self.attr_cache_stats['hit'] += 1
+                    success[attributes[idx]] = self._attr_cache[attribute]
         else:
             to_read = attribute_ids
 
@@ -208,26 +484,104 @@ class Cluster(util.ListenableMixin, util.LocalLogMixin, metaclass=Registry):
                 return success[attributes[0]]
             return success, failure
 
-        result = await self.read_attributes_raw(to_read, manufacturer=manufacturer)
-        if not isinstance(result[0], list):
-            for attrid in to_read:
-                orig_attribute = orig_attributes[attrid]
-                failure[orig_attribute] = result[0]  # Assume default response
-        else:
-            for record in result[0]:
-                orig_attribute = orig_attributes[record.attrid]
-                if record.status == 0:
-                    self._update_attribute(record.attrid, record.value.value)
-                    success[orig_attribute] = record.value.value
-                else:
-                    failure[orig_attribute] = record.status
+        records = await self._read_attributes_batched(to_read, manufacturer)
+        for attrid in to_read:
+            if attrid not in records:
+                continue
+            record = records[attrid]
+            if isinstance(record, BaseException):
+                raise record
+            status, value = record
+            if status == 0:
+                success[orig_attributes[attrid]] = value
+            else:
+                failure[orig_attributes[attrid]] = status
 
         if raw:
             # KeyError is an appropriate exception here, I think.
             return success[attributes[0]]
         return success, failure
 
-    def write_attributes(self, attributes, is_report=False, manufacturer=None):
+    def _read_attributes_batched(self, attribute_ids, manufacturer=None):
+        """Read attributes in a frame shared with concurrent reads
+
+        Returns an awaitable resolving to a dict of attribute id to either a
+        (status, value) tuple, or the exception that failed its frame.
+        """
+        batch = self._read_batches.get(manufacturer)
+        if batch is None:
+            loop = asyncio.get_event_loop()
+            batch = ([], loop.create_future())
+            self._read_batches[manufacturer] = batch
+            flush = asyncio.ensure_future(self._flush_read_batch(manufacturer, batch))
+            flush.add_done_callback(functools.partial(self._read_batch_done, manufacturer, batch))
+
+        batch_ids = batch[0]
+        batch_ids.extend(a for a in attribute_ids if a not in batch_ids)
+        return asyncio.shield(batch[1])
+
+    async def _flush_read_batch(self, manufacturer, batch):
+        if self.read_batch_delay:
+            await asyncio.sleep(self.read_batch_delay)
+        del self._read_batches[manufacturer]
+        attribute_ids, future = batch
+
+        try:
+            records = await self._read_attributes_chunked(attribute_ids, manufacturer)
+        except Exception as exc:
+            future.set_exception(exc)
+        else:
+            future.set_result(records)
+
+    def _read_batch_done(self, manufacturer, batch, flush):
+        if self._read_batches.get(manufacturer) is batch:
+            del self._read_batches[manufacturer]
+        if not batch[1].done():
+            batch[1].cancel()  # The flush was cancelled
+
+    async def _read_attributes_chunked(self, attribute_ids, manufacturer=None):
+        size = min(
+            self.read_batch_max_attributes,
+            self._max_payload(manufacturer) // 2,  # two bytes per attribute id
+        )
+        chunks = [
+            attribute_ids[i:i + size] for i in range(0, len(attribute_ids), size)
+        ]
+        window = self._endpoint.device.request_window
+
+        async def read(chunk):
+            async with window:
+                return await self.read_attributes_raw(chunk, manufacturer=manufacturer)
+
+        results = await asyncio.gather(
+            *[read(chunk) for chunk in chunks],
+            return_exceptions=True
+        )
+
+        records = {}
+        for chunk, result in zip(chunks, results):
+            if isinstance(result, BaseException):
+                for attrid in chunk:
+                    records[attrid] = result
+            elif not isinstance(result[0], list):
+                for attrid in chunk:
+                    records[attrid] = (result[0], None)  # Assume default response
+            else:
+                for record in result[0]:
+                    if record.status == 0:
+                        self._update_attribute(record.attrid, record.value.value)
+                        records[record.attrid] = (0, record.value.value)
+                    else:
+                        records[record.attrid] = (record.status, None)
+        return records
+
+    def write_attributes(self, attributes, is_report=False, manufacturer=None,
+                         mode=foundation.WriteMode.NORMAL):
+        """Write attributes
+
+        An UNDIVIDED write must fit in a single frame. A NO_RESPONSE write
+        does not wait for a reply, so writes can be pipelined.
+        """
         args = []
         for attrid, value in attributes.items():
             if isinstance(attrid, str):
@@ -256,9 +610,87 @@ class Cluster(util.ListenableMixin, util.LocalLogMixin, metaclass=Registry):
         if is_report:
             schema = foundation.COMMANDS[0x01][1]
             return self.reply(True, 0x01, schema, args, manufacturer=manufacturer)
+        if mode == foundation.WriteMode.UNDIVIDED:
+            chunks = self._split_records(args, manufacturer)
+            if len(chunks) > 1:
+                self.error("Undivided write does not fit in a single frame")
+                error = asyncio.Future()
+                error.set_exception(ValueError("Too many attributes for an undivided write"))
+                return error
+            schema = foundation.COMMANDS[mode][1]
+            return self.request(True, mode, schema, chunks[0], manufacturer=manufacturer)
+        if mode == foundation.WriteMode.NO_RESPONSE:
+            return self._send_split(mode, args, manufacturer)
+        return self._request_split(mode, args, manufacturer)
+
+    async def read_attributes_structured(self, elements, manufacturer=None):
+        """Read elements of Array, Set, Bag or Structure attributes
+
+        ``elements`` is a list of (attribute, indices) pairs, where indices
+        is an index, a tuple of nested indices or a foundation.Selector.
+        Returns (success, failure) dicts keyed by these pairs.
+        """
+        elements = list(elements)
+        records = []
+        for element in elements:
+            record = foundation.ReadAttributeStructuredRecord()
+            record.attrid, record.selector = self._structured_element(element)
+            records.append(record)
+
+        success, failure = {}, {}
+        chunks = self._split_records(records, manufacturer)
+        responses = await self._request_chunks(0x0e, chunks, manufacturer)
+        start = 0
+        for chunk, response in zip(chunks, responses):
+            chunk_elements = elements[start:start + len(chunk)]
+            start += len(chunk)
+            if not isinstance(response[0], list):
+                for element in chunk_elements:  # Default response
+                    failure[element] = foundation.Status(response[1])
+                continue
+            # Records are returned in the order of the request
+            for element, record in zip(chunk_elements, response[0]):
+                if record.status == 0:
+                    success[element] = record.value.value
+                else:
+                    failure[element] = record.status
+        return success, failure
+
+    def write_attributes_structured(self, elements, manufacturer=None):
+        """Write elements of Array, Set, Bag or Structure attributes
+
+        ``elements`` maps (attribute, indices) pairs, as for
+        read_attributes_structured, to the values to write. A value is a
+        foundation.TypeValue or an instance of a type in DATA_TYPE_IDX.
+        """
+        records = []
+        for element, value in elements.items():
+            record = foundation.WriteAttributeStructuredRecord()
+            record.attrid, record.selector = self._structured_element(element)
+            if isinstance(value, foundation.TypeValue):
+                record.value = value
+            else:
+                try:
+                    type_id = foundation.DATA_TYPE_IDX[type(value)]
+                except KeyError:
+                    raise ValueError("No ZCL data type for %r" % (value, ))
+                record.value = foundation.TypeValue()
+                record.value.type = t.uint8_t(type_id)
+                record.value.value = value
+            records.append(record)
+        return self._request_split(0x0f, records, manufacturer)
+
+    def _structured_element(self, element):
+        attribute, indices = element
+        if isinstance(attribute, str):
+            attrid = self._attridx[attribute]
         else:
-            schema = foundation.COMMANDS[0x02][1]
-            return self.request(True, 0x02, schema, args, manufacturer=manufacturer)
+            attrid = attribute
+        if isinstance(indices, foundation.Selector):
+            return t.uint16_t(attrid), indices
+        if isinstance(indices, int):
+            indices = (indices, )
+        return t.uint16_t(attrid), foundation.Selector(indices)
 
     def bind(self):
         return self._endpoint.device.zdo.bind(self._endpoint.endpoint_id, self.cluster_id)
@@ -268,15 +700,161 @@ class Cluster(util.ListenableMixin, util.LocalLogMixin, metaclass=Registry):
 
     def configure_reporting(self, attribute, min_interval, max_interval,
                             reportable_change, manufacturer=None):
+        cfg = self._reporting_config(attribute, min_interval, max_interval, reportable_change)
+        if cfg is None:
+            return
+        result = self._request_split(0x06, [cfg], manufacturer)
+        if not inspect.isawaitable(result):
+            return result
+        return asyncio.ensure_future(self._configured_reporting([cfg], result))
+
+    async def _configured_reporting(self, configs, request):
+        result = await request
+        for cfg, status in self._reporting_statuses(configs, result):
+            if status == foundation.Status.SUCCESS:
+                self._update_applied_reporting(cfg)
+        return result
+
+    @staticmethod
+    def _reporting_statuses(configs, result):
+        """Pair each config with its status from a Configure Reporting response"""
+        failed = {}
+        if not isinstance(result[0], list):
+            default = foundation.Status(result[1])  # Default response
+        else:
+            # All succeeded is a single success record without an attrid
+            default = foundation.Status.SUCCESS
+            for record in result[0]:
+                if record.status != foundation.Status.SUCCESS:
+                    failed[record.attrid] = foundation.Status(record.status)
+        return [(cfg, failed.get(cfg.attrid, default)) for cfg in configs]
+
+    async def configure_reporting_multiple(self, attributes, manufacturer=None):
+        """Configure reporting of several attributes at once
+
+        ``attributes`` maps attribute names or ids to a (min_interval,
+        max_interval, reportable_change) tuple. The configuration is sent
+        in as few frames as fit the device payload size. Returns a dict of
+        the attributes to their foundation.Status.
+        """
+        statuses = {}
+        orig_attributes = {}
+        configs = []
+        for attribute, (min_interval, max_interval, reportable_change) in attributes.items():
+            cfg = self._reporting_config(attribute, min_interval, max_interval, reportable_change)
+            if cfg is None:
+                statuses[attribute] = foundation.Status.UNSUPPORTED_ATTRIBUTE
+                continue
+            orig_attributes[cfg.attrid] = attribute
+            configs.append(cfg)
+        if not configs:
+            return statuses
+
+        chunks = self._split_records(configs, manufacturer)
+        results = await self._request_chunks(0x06, chunks, manufacturer)
+        for chunk, result in zip(chunks, results):
+            for cfg, status in self._reporting_statuses(chunk, result):
+                statuses[orig_attributes[cfg.attrid]] = status
+                if status == foundation.Status.SUCCESS:
+                    self._update_applied_reporting(cfg)
+        return statuses
+
+    async def read_reporting_configuration(self, attributes, manufacturer=None):
+        """Read the reporting configuration of attributes from the device
+
+        Returns a dict of the attributes to either their
+        AttributeReportingConfig, or the foundation.Status of the failure.
+        """
+        records = []
+        orig_attributes = {}
+        for attribute in attributes:
+            if isinstance(attribute, str):
+                attrid = self._attridx[attribute]
+            else:
+                attrid = attribute
+            orig_attributes[attrid] = attribute
+            record = foundation.ReadReportingConfigRecord()
+            record.direction = 0
+            record.attrid = attrid
+            records.append(record)
+
+        result = {}
+        chunks = self._split_records(records, manufacturer)
+        responses = await self._request_chunks(0x08, chunks, manufacturer)
+        for chunk, response in zip(chunks, responses):
+            if not isinstance(response[0], list):
+                for record in chunk:  # Default response
+                    result[orig_attributes[record.attrid]] = foundation.Status(response[1])
+                continue
+            for cfg in response[0]:
+                if cfg.attrid not in orig_attributes:
+                    continue
+                if cfg.status == foundation.Status.SUCCESS:
+                    result[orig_attributes[cfg.attrid]] = cfg
+                else:
+                    result[orig_attributes[cfg.attrid]] = cfg.status
+        return result
+
+    async def reconcile_reporting(self, attributes, manufacturer=None, read_device=True):
+        """Configure reporting only for attributes whose configuration differs
+
+        ``attributes`` is a mapping like for configure_reporting_multiple.
+        The current configuration is read from the device, or with
+        ``read_device=False`` taken from the configuration zigpy last
+        applied. A configuration read from the device is only recorded as
+        applied when it is the wanted one. Returns a dict of the attributes
+        to their foundation.Status.
+        """
+        statuses = {}
+        wanted = {}
+        for attribute, (min_interval, max_interval, reportable_change) in attributes.items():
+            cfg = self._reporting_config(attribute, min_interval, max_interval, reportable_change)
+            if cfg is None:
+                statuses[attribute] = foundation.Status.UNSUPPORTED_ATTRIBUTE
+                continue
+            wanted[cfg.attrid] = (attribute, cfg)
+        if not wanted:
+            return statuses
+
+        current = {}
+        if read_device:
+            configs = await self.read_reporting_configuration(list(wanted), manufacturer)
+            for attrid, cfg in configs.items():
+                if not isinstance(cfg, foundation.Status):
+                    current[attrid] = cfg
+        else:
+            for attrid in wanted:
+                if attrid in self._applied_reporting:
+                    current[attrid] = self._reporting_config(attrid, *self._applied_reporting[attrid])
+
+        to_configure = {}
+        for attrid, (attribute, cfg) in wanted.items():
+            if attrid in current and _reporting_bytes(current[attrid]) == _reporting_bytes(cfg):
+                statuses[attribute] = foundation.Status.SUCCESS
+                self._update_applied_reporting(cfg)
+            else:
+                to_configure[attribute] = attributes[attribute]
+        if to_configure:
+            self.debug("Reconfiguring reporting for %s", list(to_configure))
+            statuses.update(await self.configure_reporting_multiple(to_configure, manufacturer))
+        return statuses
+
+    def _update_applied_reporting(self, cfg):
+        config = (cfg.min_interval, cfg.max_interval, getattr(cfg, 'reportable_change', None))
+        if self._applied_reporting.get(cfg.attrid) == config:
+            return
+        self._applied_reporting[cfg.attrid] = config
+        self.optional_listener_event('reporting_configured', cfg.attrid, *config)
+
+    def _reporting_config(self, attribute, min_interval, max_interval, reportable_change):
         if isinstance(attribute, str):
             attrid = self._attridx.get(attribute, None)
         else:
             attrid = attribute
         if attrid not in self.attributes or attrid is None:
             self.error("{} is not a valid attribute id".format(attribute))
-            return
+            return None
 
-        schema = foundation.COMMANDS[0x06][1]
         cfg = foundation.AttributeReportingConfig()
         cfg.direction = 0
         cfg.attrid = attrid
@@ -286,9 +864,95 @@ class Cluster(util.ListenableMixin, util.LocalLogMixin, metaclass=Registry):
         cfg.min_interval = min_interval
         cfg.max_interval = max_interval
         cfg.reportable_change = reportable_change
-        return self.request(
-            True, 0x06, schema, [cfg], manufacturer=manufacturer
-        )
+        return cfg
+
+    def _max_payload(self, manufacturer=None):
+        """The ZCL payload size which fits in a single frame to the device"""
+        header = 5 if manufacturer is not None else 3
+        return self._endpoint.device.max_payload - header
+
+    def _split_records(self, records, manufacturer=None):
+        """Split records into chunks which each fit in a single frame
+
+        Records with a fixed layout are measured without serializing them,
+        others are serialized into a scratch buffer.
+        """
+        max_size = self._max_payload(manufacturer)
+        chunks = []
+        chunk, size = [], 0
+        scratch = bytearray()
+        for record in records:
+            record_type = type(record)
+            codec = getattr(record_type, '_struct_codec', None)
+            if codec is not None and record_type.serialize_into is t.Struct.serialize_into:
+                length = codec.size
+            else:
+                del scratch[:]
+                record.serialize_into(scratch)
+                length = len(scratch)
+            if chunk and size + length > max_size:
+                chunks.append(chunk)
+                chunk, size = [], 0
+            chunk.append(record)
+            size += length
+        if chunk or not chunks:
+            chunks.append(chunk)
+        return chunks
+
+    def _request_split(self, command_id, records, manufacturer=None):
+        """Send a foundation request, split over several frames if needed
+
+        The frames are pipelined within the device request window and the
+        status records of the responses are merged into a single response.
+        """
+        schema = foundation.COMMANDS[command_id][1]
+        chunks = self._split_records(records, manufacturer)
+        if len(chunks) == 1:
+            return self.request(True, command_id, schema, chunks[0], manufacturer=manufacturer)
+        return self._request_pipelined(command_id, chunks, manufacturer)
+
+    def _send_split(self, command_id, records, manufacturer=None):
+        """Send a foundation request without a reply, split over several
+        frames if needed
+
+        Nothing is waited for between the frames, so they are not limited
+        by the device request window.
+        """
+        schema = foundation.COMMANDS[command_id][1]
+        chunks = self._split_records(records, manufacturer)
+        requests = [
+            self.request(True, command_id, schema, chunk,
+                         manufacturer=manufacturer, expect_reply=False)
+            for chunk in chunks
+        ]
+        if len(requests) == 1:
+            return requests[0]
+        return asyncio.gather(*requests)
+
+    async def _request_chunks(self, command_id, chunks, manufacturer=None):
+        """Send each chunk of records in its own frame, pipelined within the
+        device request window, and return the responses in order"""
+        schema = foundation.COMMANDS[command_id][1]
+        window = self._endpoint.device.request_window
+
+        async def send(chunk):
+            async with window:
+                return await self.request(True, command_id, schema, chunk, manufacturer=manufacturer)
+
+        return await asyncio.gather(*[send(chunk) for chunk in chunks])
+
+    async def _request_pipelined(self, command_id, chunks, manufacturer=None):
+        results = await self._request_chunks(command_id, chunks, manufacturer)
+
+        records = []
+        for result in results:
+            if not isinstance(result[0], list):
+                return result  # Default response
+            # All succeeded is a single success record without an attrid
+            records.extend(r for r in result[0] if r.status != foundation.Status.SUCCESS)
+        if not records:
+            return results[0]
+        return [records]
 
     def command(self, command, *args, manufacturer=None, expect_reply=True):
         schema = self.server_commands[command][1]
@@ -311,9 +975,35 @@ class Cluster(util.ListenableMixin, util.LocalLogMixin, metaclass=Registry):
         return list(self._server_command_idx.keys())
 
     def _update_attribute(self, attrid, value):
-        self._attr_cache[attrid] = value
+        self._cache_attribute(attrid, value, self._update_source, time.time())
         self.listener_event('attribute_updated', attrid, value)
 
+    def _cache_attribute(self, attrid, value, source, timestamp=None):
+        self._attr_cache[attrid] = value
+        self._attr_last_updated[attrid] = (timestamp, source)
+
+    def _is_fresh(self, attrid, max_age, now=None):
+        timestamp, _ = self._attr_last_updated.get(attrid, (None, None))
+        if timestamp is None:
+            return False
+        if now is None:
+            now = time.time()
+        return now - timestamp <= max_age
+
+    def cache_freshness(self):
+        """Return the age in seconds and source of each cached attribute
+
+        The age is None when it is unknown, such as for values loaded from
+        the database.
+        """
+        now = time.time()
+        freshness = {}
+        for attrid in self._attr_cache:
+            timestamp, source = self._attr_last_updated.get(attrid, (None, None))
+            age = None if timestamp is None else now - timestamp
+            freshness[attrid] = (age, source)
+        return freshness
+
     def log(self, lvl, msg, *args):
         msg = '[0x%04x:%s:0x%04x] ' + msg
         args = (
@@ -338,20 +1028,36 @@ class Cluster(util.ListenableMixin, util.LocalLogMixin, metaclass=Registry):
             raise AttributeError("No such command name: %s" % (name, ))
 
     def __getitem__(self, key):
-        return self.read_attributes([key], allow_cache=True, raw=True)
+        return self.read_attributes([key], allow_cache=True, raw=True, max_age=self.cache_max_age)
 
     @util.retryable_request
     def _discover(self, cmd_id, start_item, num_of_items,
                   manufacturer=None, tries=3):
+        discovered = self._discovered.get((cmd_id, manufacturer))
+        if discovered is not None:
+            records = [r for r in discovered if _discovered_id(r) >= start_item]
+            result = asyncio.Future()
+            result.set_result([
+                t.Bool(len(records) <= num_of_items), records[:num_of_items]
+            ])
+            return result
+
         schema = foundation.COMMANDS[cmd_id][1]
         return self.request(
             True, cmd_id, schema, start_item, num_of_items,
             manufacturer=manufacturer)
 
+    def _discover_all(self, cmd_id, manufacturer=None):
+        return DiscoveryIterator(self, cmd_id, manufacturer)
+
     discover_attributes = functools.partialmethod(_discover, 0x0c)
     discover_attributes_extended = functools.partialmethod(_discover, 0x15)
     discover_commands_received = functools.partialmethod(_discover, 0x11)
     discover_commands_generated = functools.partialmethod(_discover, 0x13)
+    discover_all_attributes = functools.partialmethod(_discover_all, 0x0c)
+    discover_all_attributes_extended = functools.partialmethod(_discover_all, 0x15)
+    discover_all_commands_received = functools.partialmethod(_discover_all, 0x11)
+    discover_all_commands_generated = functools.partialmethod(_discover_all, 0x13)
 
 
 # Import to populate the registry
@@ -50,27 +50,42 @@ class Discrete:
 
 
 class TypeValue:
+    __slots__ = ('type', 'value')
+
     def serialize(self):
-        return self.type.to_bytes(1, 'little') + self.value.serialize()
+        buf = bytearray()
+        self.serialize_into(buf)
+        return bytes(buf)
+
+    def serialize_into(self, buf):
+        buf.append(self.type)
+        self.value.serialize_into(buf)
 
     @classmethod
     def deserialize(cls, data):
+        self, offset = cls.deserialize_from(data, 0)
+        return self, data[offset:]
+
+    @classmethod
+    def deserialize_from(cls, data, offset):
         self = cls()
-        self.type, data = data[0], data[1:]
+        self.type = data[offset]
         python_type = DATA_TYPES[self.type][1]
-        self.value, data = python_type.deserialize(data)
-        return self, data
+        self.value, offset = python_type.deserialize_from(data, offset + 1)
+        return self, offset
 
 
 class TypedCollection(TypeValue):
+    __slots__ = ()
+
     @classmethod
-    def deserialize(cls, data):
+    def deserialize_from(cls, data, offset):
         self = cls()
-        self.type, data = data[0], data[1:]
+        self.type = data[offset]
         python_item_type = DATA_TYPES[self.type][1]
         python_type = t.LVList(python_item_type)
-        self.value, data = python_type.deserialize(data)
-        return self, data
+        self.value, offset = python_type.deserialize_from(data, offset + 1)
+        return self, offset
 
 
 DATA_TYPES = {
@@ -115,8 +130,8 @@ DATA_TYPES = {
     0x3a: ('Floating point', t.Double, Analog),
     0x41: ('Octet string', t.LVBytes, Discrete),
     0x42: ('Character string', t.LVBytes, Discrete),
-    # 0x43: ('Long octet string', ),
-    # 0x44: ('Long character string', ),
+    0x43: ('Long octet string', t.LongOctetString, Discrete),
+    0x44: ('Long character string', t.LongCharacterString, Discrete),
     0x48: ('Array', TypedCollection, Discrete),
     0x4c: ('Structure', t.LVList(TypeValue, 2), Discrete),
     0x50: ('Set', TypedCollection, Discrete),
@@ -140,26 +155,91 @@ DATA_TYPE_IDX = {
 DATA_TYPE_IDX[t.uint32_t] = 0x23
 DATA_TYPE_IDX[t.EUI64] = 0xf0
 DATA_TYPE_IDX[t.Bool] = 0x10
+DATA_TYPE_IDX[t.LongOctetString] = 0x43
+DATA_TYPE_IDX[t.LongCharacterString] = 0x44
+
+
+_DATA_TYPE_DESERIALIZERS = {
+    tidx: python_type.deserialize_from
+    for tidx, (tname, python_type, ad) in DATA_TYPES.items()
+    if python_type is not None
+}
+
+
+class AttributeReportList(list):
+    """Report attributes payload as compact (attrid, type, value) tuples
+
+    Records are decoded straight from the frame buffer, without building
+    an Attribute and TypeValue object per reported attribute.
+    """
+    def serialize(self):
+        buf = bytearray()
+        self.serialize_into(buf)
+        return bytes(buf)
+
+    def serialize_into(self, buf):
+        for record in self:
+            if not isinstance(record, tuple):
+                record.serialize_into(buf)
+                continue
+            attrid, type_, value = record
+            python_type = DATA_TYPES[type_][1]
+            if type(value) is not python_type:
+                value = python_type(value)
+            buf += attrid.to_bytes(2, 'little')
+            buf.append(type_)
+            value.serialize_into(buf)
+
+    @classmethod
+    def deserialize(cls, data):
+        r, offset = cls.deserialize_from(data, 0)
+        return r, data[offset:]
+
+    @classmethod
+    def deserialize_from(cls, data, offset):
+        r = cls()
+        deserializers = _DATA_TYPE_DESERIALIZERS
+        end = len(data)
+        while offset < end:
+            attrid = data[offset] | (data[offset + 1] << 8)
+            type_ = data[offset + 2]
+            value, offset = deserializers[type_](data, offset + 3)
+            r.append((attrid, type_, value))
+        return r, offset
+
+    def __str__(self):
+        return ", ".join(["%s=%s" % (attrid, value) for attrid, _, value in self])
 
 
 class ReadAttributeRecord():
+    __slots__ = ('attrid', 'status', 'value')
+
     @classmethod
     def deserialize(cls, data):
+        r, offset = cls.deserialize_from(data, 0)
+        return r, data[offset:]
+
+    @classmethod
+    def deserialize_from(cls, data, offset):
         r = cls()
-        r.attrid, data = int.from_bytes(data[:2], 'little'), data[2:]
-        r.status, data = data[0], data[1:]
+        r.attrid = int.from_bytes(data[offset:offset + 2], 'little')
+        r.status = data[offset + 2]
+        offset += 3
         if r.status == 0:
-            r.value, data = TypeValue.deserialize(data)
+            r.value, offset = TypeValue.deserialize_from(data, offset)
 
-        return r, data
+        return r, offset
 
     def serialize(self):
-        r = t.uint16_t(self.attrid).serialize()
-        r += t.uint8_t(self.status).serialize()
-        if self.status == 0:
-            r += self.value.serialize()
+        buf = bytearray()
+        self.serialize_into(buf)
+        return bytes(buf)
 
-        return r
+    def serialize_into(self, buf):
+        buf += self.attrid.to_bytes(2, 'little')
+        buf.append(self.status)
+        if self.status == 0:
+            self.value.serialize_into(buf)
 
     def __repr__(self):
         r = '<ReadAttributeRecord attrid=%s status=%s' % (self.attrid, self.status)
@@ -176,6 +256,13 @@ class Attribute(t.Struct):
     ]
 
 
+class WriteMode(enum.IntEnum):
+    """Write attributes command variants"""
+    NORMAL = 0x02
+    UNDIVIDED = 0x03  # All attributes are written, or none
+    NO_RESPONSE = 0x05
+
+
 class WriteAttributesStatusRecord(t.Struct):
     _fields = [
         ('status', Status),
@@ -183,42 +270,192 @@ class WriteAttributesStatusRecord(t.Struct):
     ]
 
 
+class SelectorMode(enum.IntEnum):
+    """Write mode of a structured write selector"""
+    OVERWRITE = 0b0000
+    ADD = 0b0001
+    REMOVE = 0b0010
+
+
+class Selector:
+    """Indices of an element of an Array, Set, Bag or Structure attribute
+
+    The element is reached by indexing the attribute with each index in
+    turn. Index 0 of an array or structure selects its number of elements.
+    """
+    __slots__ = ('indices', 'mode')
+
+    def __init__(self, indices=(), mode=SelectorMode.OVERWRITE):
+        self.indices = list(indices)
+        self.mode = mode
+
+    def serialize(self):
+        buf = bytearray()
+        self.serialize_into(buf)
+        return bytes(buf)
+
+    def serialize_into(self, buf):
+        if len(self.indices) > 0x0f:
+            raise ValueError("A selector has at most 15 indices")
+        buf.append((self.mode << 4) | len(self.indices))
+        for index in self.indices:
+            buf += int.to_bytes(index, 2, 'little')
+
+    @classmethod
+    def deserialize(cls, data):
+        self, offset = cls.deserialize_from(data, 0)
+        return self, data[offset:]
+
+    @classmethod
+    def deserialize_from(cls, data, offset):
+        indicator = data[offset]
+        offset += 1
+        indices = []
+        for i in range(indicator & 0x0f):
+            index, offset = t.uint16_t.deserialize_from(data, offset)
+            indices.append(index)
+        return cls(indices, SelectorMode(indicator >> 4)), offset
+
+    def __eq__(self, other):
+        if not isinstance(other, Selector):
+            return NotImplemented
+        return self.indices == other.indices and self.mode == other.mode
+
+    def __hash__(self):
+        return hash((tuple(self.indices), self.mode))
+
+    def __repr__(self):
+        return '<Selector indices=%s mode=%s>' % (self.indices, self.mode.name)
+
+
+class ReadAttributeStructuredRecord(t.Struct):
+    _fields = [
+        ('attrid', t.uint16_t),
+        ('selector', Selector),
+    ]
+
+
+class WriteAttributeStructuredRecord(t.Struct):
+    _fields = [
+        ('attrid', t.uint16_t),
+        ('selector', Selector),
+        ('value', TypeValue),
+    ]
+
+
+class WriteAttributeStructuredStatusRecord:
+    """Status of a structured write
+
+    A response where all writes succeeded only holds a success status.
+    """
+    __slots__ = ('status', 'attrid', 'selector')
+
+    def serialize(self):
+        buf = bytearray()
+        self.serialize_into(buf)
+        return bytes(buf)
+
+    def serialize_into(self, buf):
+        buf.append(self.status)
+        if self.status != Status.SUCCESS:
+            buf += int.to_bytes(self.attrid, 2, 'little')
+            self.selector.serialize_into(buf)
+
+    @classmethod
+    def deserialize(cls, data):
+        self, offset = cls.deserialize_from(data, 0)
+        return self, data[offset:]
+
+    @classmethod
+    def deserialize_from(cls, data, offset):
+        self = cls()
+        self.status, offset = Status.deserialize_from(data, offset)
+        if self.status != Status.SUCCESS:
+            self.attrid, offset = t.uint16_t.deserialize_from(data, offset)
+            self.selector, offset = Selector.deserialize_from(data, offset)
+        return self, offset
+
+    def __repr__(self):
+        return '<WriteAttributeStructuredStatusRecord status=%s attrid=%s selector=%s>' % (
+            self.status, getattr(self, 'attrid', None), getattr(self, 'selector', None))
+
+
 class AttributeReportingConfig:
+    __slots__ = (
+        'direction', 'attrid', 'datatype', 'min_interval', 'max_interval',
+        'reportable_change', 'timeout',
+    )
+
     def serialize(self):
-        r = int.to_bytes(self.direction, 1, 'little')
-        r += int.to_bytes(self.attrid, 2, 'little')
+        buf = bytearray()
+        self.serialize_into(buf)
+        return bytes(buf)
+
+    def serialize_into(self, buf):
+        buf.append(self.direction)
+        buf += int.to_bytes(self.attrid, 2, 'little')
         if self.direction:
-            r += int.to_bytes(self.timeout, 2, 'little')
+            buf += int.to_bytes(self.timeout, 2, 'little')
         else:
-            r += (
-                int.to_bytes(self.datatype, 1, 'little') +
-                int.to_bytes(self.min_interval, 2, 'little') +
-                int.to_bytes(self.max_interval, 2, 'little')
-            )
+            buf.append(self.datatype)
+            buf += int.to_bytes(self.min_interval, 2, 'little')
+            buf += int.to_bytes(self.max_interval, 2, 'little')
             datatype = DATA_TYPES.get(self.datatype, None)
             if datatype and datatype[2] is Analog:
                 datatype = datatype[1]
-                r += datatype(self.reportable_change).serialize()
-        return r
+                datatype(self.reportable_change).serialize_into(buf)
 
     @classmethod
     def deserialize(cls, data):
+        self, offset = cls.deserialize_from(data, 0)
+        return self, data[offset:]
+
+    @classmethod
+    def deserialize_from(cls, data, offset):
         self = cls()
-        self.direction, data = t.Bool.deserialize(data)
-        self.attrid, data = t.uint16_t.deserialize(data)
+        self.direction, offset = t.Bool.deserialize_from(data, offset)
+        self.attrid, offset = t.uint16_t.deserialize_from(data, offset)
         if self.direction:
             # Requesting things to be received by me
-            self.timeout, data = t.uint16_t.deserialize(data)
+            self.timeout, offset = t.uint16_t.deserialize_from(data, offset)
         else:
             # Notifying that I will report things to you
-            self.datatype, data = t.uint8_t.deserialize(data)
-            self.min_interval, data = t.uint16_t.deserialize(data)
-            self.max_interval, data = t.uint16_t.deserialize(data)
+            self.datatype, offset = t.uint8_t.deserialize_from(data, offset)
+            self.min_interval, offset = t.uint16_t.deserialize_from(data, offset)
+            self.max_interval, offset = t.uint16_t.deserialize_from(data, offset)
             datatype = DATA_TYPES[self.datatype]
             if datatype[2] is Analog:
-                self.reportable_change, data = datatype[1].deserialize(data)
+                self.reportable_change, offset = datatype[1].deserialize_from(data, offset)
+
+        return self, offset
+
+
+class ReadReportingConfigResponseRecord(AttributeReportingConfig):
+    """A reporting configuration preceded by its status
+
+    Only the direction and attribute id follow an unsuccessful status.
+    """
+    __slots__ = ('status', )
 
-        return self, data
+    def serialize_into(self, buf):
+        buf.append(self.status)
+        if self.status == Status.SUCCESS:
+            super().serialize_into(buf)
+        else:
+            buf.append(self.direction)
+            buf += int.to_bytes(self.attrid, 2, 'little')
+
+    @classmethod
+    def deserialize_from(cls, data, offset):
+        status, offset = Status.deserialize_from(data, offset)
+        if status == Status.SUCCESS:
+            self, offset = super().deserialize_from(data, offset)
+        else:
+            self = cls()
+            self.direction, offset = t.uint8_t.deserialize_from(data, offset)
+            self.attrid, offset = t.uint16_t.deserialize_from(data, offset)
+        self.status = status
+        return self, offset
 
 
 class ConfigureReportingResponseRecord(t.Struct):
@@ -264,7 +501,7 @@ class DiscoverAttributesExtendedResponseRecord(t.Struct):
 
 COMMANDS = {
     # id: (name, params, is_response)
-    0x00: ('Read attributes', (t.List(t.uint16_t), ), False),
+    0x00: ('Read attributes', (t.NumericList(t.uint16_t), ), False),
     0x01: ('Read attributes response', (t.List(ReadAttributeRecord), ), True),
     0x02: ('Write attributes', (t.List(Attribute), ), False),
     0x03: ('Write attributes undivided', (t.List(Attribute), ), False),
@@ -273,14 +510,14 @@ COMMANDS = {
     0x06: ('Configure reporting', (t.List(AttributeReportingConfig), ), False),
     0x07: ('Configure reporting response', (t.List(ConfigureReportingResponseRecord), ), True),
     0x08: ('Read reporting configuration', (t.List(ReadReportingConfigRecord), ), False),
-    0x09: ('Read reporting configuration response', (t.List(AttributeReportingConfig), ), True),
-    0x0a: ('Report attributes', (t.List(Attribute), ), False),
+    0x09: ('Read reporting configuration response', (t.List(ReadReportingConfigResponseRecord), ), True),
+    0x0a: ('Report attributes', (AttributeReportList, ), False),
     0x0b: ('Default response', (t.uint8_t, Status), True),
     0x0c: ('Discover attributes', (t.uint16_t, t.uint8_t), False),
     0x0d: ('Discover attributes response', (t.Bool, t.List(DiscoverAttributesResponseRecord), ), True),
-    # 0x0e: ('Read attributes structured', (, ), False),
-    # 0x0f: ('Write attributes structured', (, ), False),
-    # 0x10: ('Write attributes structured response', (, ), True),
+    0x0e: ('Read attributes structured', (t.List(ReadAttributeStructuredRecord), ), False),
+    0x0f: ('Write attributes structured', (t.List(WriteAttributeStructuredRecord), ), False),
+    0x10: ('Write attributes structured response', (t.List(WriteAttributeStructuredStatusRecord), ), True),
     0x11: ('Discover commands received', (t.uint8_t, t.uint8_t), False),
     0x12: ('Discover commands received response', (t.Bool, t.List(t.uint8_t)), True),
     0x13: ('Discover commands generated', (t.uint8_t, t.uint8_t), False),
@@ -288,3 +525,6 @@ COMMANDS = {
     0x15: ('Discover attributes extended', (t.uint16_t, t.uint8_t), False),
     0x16: ('Discover attributes extended response', (t.Bool, t.List(DiscoverAttributesExtendedResponseRecord)), True),
 }
+
+# Requests which can be answered from a single identical in-flight request
+IDEMPOTENT_COMMANDS = frozenset((0x00, 0x08, 0x0c, 0x0e, 0x11, 0x13, 0x15))
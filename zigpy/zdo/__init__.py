@@ -18,23 +18,26 @@ class ZDO(zigpy.util.LocalLogMixin, zigpy.util.ListenableMixin):
 
     def _serialize(self, command, *args):
         sequence = self._device.application.get_sequence()
-        data = sequence.to_bytes(1, 'little')
+        data = bytearray((sequence, ))
         schema = types.CLUSTERS[command][2]
-        data += t.serialize(args, schema)
-        return sequence, data
+        t.serialize_into(args, schema, data)
+        return sequence, bytes(data)
 
-    def deserialize(self, cluster_id, data):
-        tsn, data = data[0], data[1:]
+    def deserialize(self, cluster_id, data, lazy=False):
+        tsn = data[0]
 
         is_reply = bool(cluster_id & 0x8000)
         try:
             cluster_details = types.CLUSTERS[cluster_id]
         except KeyError:
             LOGGER.warning("Unknown ZDO cluster 0x%02x", cluster_id)
-            return tsn, cluster_id, is_reply, data
+            return tsn, cluster_id, is_reply, data[1:]
 
-        args, data = t.deserialize(data, cluster_details[2])
-        if data != b'':
+        if lazy:
+            return tsn, cluster_id, is_reply, t.LazyValues(data, cluster_details[2], 1)
+
+        args, offset = t.deserialize_from(data, cluster_details[2], 1)
+        if offset < len(data):
             # TODO: Seems sane to check, but what should we do?
             LOGGER.warning("Data remains after deserializing ZDO frame")
 
@@ -117,9 +120,10 @@ class ZDO(zigpy.util.LocalLogMixin, zigpy.util.ListenableMixin):
 def broadcast(app, command, grpid, radius, *args,
               broadcast_address=t.BroadcastAddress.RX_ON_WHEN_IDLE):
     sequence = app.get_sequence()
-    data = sequence.to_bytes(1, 'little')
+    data = bytearray((sequence, ))
     schema = types.CLUSTERS[command][2]
-    data += t.serialize(args, schema)
+    t.serialize_into(args, schema, data)
+    data = bytes(data)
     return zigpy.device.broadcast(
         app, 0, command, 0, 0, grpid, radius, sequence, data,
         broadcast_address=broadcast_address
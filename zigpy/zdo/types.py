@@ -16,21 +16,23 @@ class SimpleDescriptor(t.Struct):
         ('profile', t.uint16_t),
         ('device_type', t.uint16_t),
         ('device_version', t.uint8_t),
-        ('input_clusters', t.LVList(t.uint16_t)),
-        ('output_clusters', t.LVList(t.uint16_t)),
+        ('input_clusters', t.LVNumericList(t.uint16_t)),
+        ('output_clusters', t.LVNumericList(t.uint16_t)),
     ]
 
 
 class SizePrefixedSimpleDescriptor(SimpleDescriptor):
-    def serialize(self):
-        data = super().serialize()
-        return len(data).to_bytes(1, 'little') + data
+    def serialize_into(self, buf):
+        start = len(buf)
+        buf.append(0)
+        super().serialize_into(buf)
+        buf[start] = len(buf) - start - 1
 
     @classmethod
-    def deserialize(cls, data):
-        if not data or data[0] == 0:
-            return None, data[1:]
-        return SimpleDescriptor.deserialize(data[1:])
+    def deserialize_from(cls, data, offset):
+        if offset >= len(data) or data[offset] == 0:
+            return None, offset + 1
+        return SimpleDescriptor.deserialize_from(data, offset + 1)
 
 
 class NodeDescriptor(t.Struct):
@@ -58,30 +60,37 @@ class MultiAddress:
 
     @classmethod
     def deserialize(cls, data):
+        r, offset = cls.deserialize_from(data, 0)
+        return r, data[offset:]
+
+    @classmethod
+    def deserialize_from(cls, data, offset):
         r = cls()
-        r.addrmode, data = data[0], data[1:]
+        r.addrmode = data[offset]
+        offset += 1
         if r.addrmode == 0x01:
-            r.nwk, data = t.uint16_t.deserialize(data)
+            r.nwk, offset = t.uint16_t.deserialize_from(data, offset)
         elif r.addrmode == 0x03:
-            r.ieee, data = t.EUI64.deserialize(data)
-            r.endpoint, data = t.uint8_t.deserialize(data)
+            r.ieee, offset = t.EUI64.deserialize_from(data, offset)
+            r.endpoint, offset = t.uint8_t.deserialize_from(data, offset)
         else:
             raise ValueError("Invalid MultiAddress - unknown address mode")
 
-        return r, data
+        return r, offset
 
     def serialize(self):
+        buf = bytearray()
+        self.serialize_into(buf)
+        return bytes(buf)
+
+    def serialize_into(self, buf):
         if self.addrmode == 0x01:
-            return (
-                self.addrmode.to_bytes(1, 'little') +
-                self.nwk.to_bytes(2, 'little')
-            )
+            buf.append(self.addrmode)
+            buf += self.nwk.to_bytes(2, 'little')
         elif self.addrmode == 0x03:
-            return (
-                self.addrmode.to_bytes(1, 'little') +
-                self.ieee.serialize() +
-                self.endpoint.to_bytes(1, 'little')
-            )
+            buf.append(self.addrmode)
+            self.ieee.serialize_into(buf)
+            buf.append(self.endpoint)
         else:
             raise ValueError("Invalid value for addrmode")
 
@@ -176,7 +185,7 @@ CLUSTERS = {
     0x0003: ('Power_Desc_req', (NWKI, )),
     0x0004: ('Simple_Desc_req', (NWKI, ('EndPoint', t.uint8_t))),
     0x0005: ('Active_EP_req', (NWKI, )),
-    0x0006: ('Match_Desc_req', (NWKI, ('ProfileID', t.uint16_t), ('InClusterList', t.LVList(t.uint16_t)), ('OutClusterList', t.LVList(t.uint16_t)))),
+    0x0006: ('Match_Desc_req', (NWKI, ('ProfileID', t.uint16_t), ('InClusterList', t.LVNumericList(t.uint16_t)), ('OutClusterList', t.LVNumericList(t.uint16_t)))),
     # 0x0010: ('Complex_Desc_req', (NWKI, )),
     0x0011: ('User_Desc_req', (NWKI, )),
     0x0012: ('Discovery_Cache_req', (NWK, IEEE)),
@@ -206,8 +215,8 @@ CLUSTERS = {
 
     # Responses
     # Device and Service Discovery Server Responses
-    0x8000: ('NWK_addr_rsp', (STATUS, IEEE, NWK, ('NumAssocDev', t.uint8_t), ('StartIndex', t.uint8_t), ('NWKAddressAssocDevList', t.List(t.uint16_t)))),
-    0x8001: ('IEEE_addr_rsp', (STATUS, IEEE, NWK, ('NumAssocDev', t.uint8_t), ('StartIndex', t.uint8_t), ('NWKAddrAssocDevList', t.List(t.uint16_t)))),
+    0x8000: ('NWK_addr_rsp', (STATUS, IEEE, NWK, ('NumAssocDev', t.uint8_t), ('StartIndex', t.uint8_t), ('NWKAddressAssocDevList', t.NumericList(t.uint16_t)))),
+    0x8001: ('IEEE_addr_rsp', (STATUS, IEEE, NWK, ('NumAssocDev', t.uint8_t), ('StartIndex', t.uint8_t), ('NWKAddrAssocDevList', t.NumericList(t.uint16_t)))),
     0x8002: ('Node_Desc_rsp', (STATUS, NWKI, ('NodeDescriptor', NodeDescriptor))),
     0x8003: ('Power_Desc_rsp', (STATUS, NWKI, ('PowerDescriptor', PowerDescriptor))),
     0x8004: ('Simple_Desc_rsp', (STATUS, NWKI, ('SimpleDescriptor', SizePrefixedSimpleDescriptor))),
@@ -225,7 +234,7 @@ CLUSTERS = {
     0x801a: ('Simple_Desc_store_rsp', (STATUS, )),
     0x801b: ('Remove_node_cache_rsp', (STATUS, )),
     0x801c: ('Find_node_cache_rsp', (('CacheNWKAddr', t.EUI64), NWK, IEEE)),
-    0x801d: ('Extended_Simple_Desc_rsp', (STATUS, NWK, ('Endpoint', t.uint8_t), ('AppInputClusterCount', t.uint8_t), ('AppOutputClusterCount', t.uint8_t), ('StartIndex', t.uint8_t), ('AppClusterList', t.List(t.uint16_t)))),
+    0x801d: ('Extended_Simple_Desc_rsp', (STATUS, NWK, ('Endpoint', t.uint8_t), ('AppInputClusterCount', t.uint8_t), ('AppOutputClusterCount', t.uint8_t), ('StartIndex', t.uint8_t), ('AppClusterList', t.NumericList(t.uint16_t)))),
     0x801e: ('Extended_Active_EP_rsp', (STATUS, NWKI, ('ActiveEPCount', t.uint8_t), ('StartIndex', t.uint8_t), ('ActiveEPList', t.List(t.uint8_t)))),
     #  Bind Management Server Services Responses
     0x8020: ('End_Device_Bind_rsp', (STATUS, )),
@@ -245,5 +254,5 @@ CLUSTERS = {
 # Rewrite to (name, param_names, param_types)
 for command_id, c in CLUSTERS.items():
     param_names = [p[0] for p in c[1]]
-    param_types = [p[1] for p in c[1]]
+    param_types = tuple(p[1] for p in c[1])
     CLUSTERS[command_id] = (c[0], param_names, param_types)